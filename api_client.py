@@ -3,108 +3,678 @@ API Client for Chart Generation
 Handles POST requests to external API endpoint with custom payload structure.
 """
 
+import asyncio
+import functools
+import importlib.util
 import json
+import logging
 import re
+import threading
+from types import MappingProxyType
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from config import get_config
+from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Transient HTTP statuses worth retrying with backoff
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Prefer orjson for the large prediction payloads, then ujson, then stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda obj: orjson.dumps(obj).decode('utf-8')
+    _canonical = lambda obj: orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    try:
+        import ujson
+        _loads = ujson.loads
+        _dumps = lambda obj: ujson.dumps(obj, escape_forward_slashes=False)
+        _canonical = lambda obj: ujson.dumps(obj, sort_keys=True, escape_forward_slashes=False).encode('utf-8')
+    except ImportError:
+        _loads = json.loads
+        _dumps = json.dumps
+        _canonical = lambda obj: json.dumps(obj, sort_keys=True).encode('utf-8')
+
+# Optional SIMD parser for API response bodies, which supports lazy field access
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Optional single-pass keyword matchers for chart type detection: Hyperscan's
+# SIMD DFA first, then pyahocorasick
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Every backend's decode error subclasses ValueError, so catch them all alike
+_JSONError = (json.JSONDecodeError, ValueError)
+
+# Tokens for the balanced-object scanner: the next brace or quote, and the
+# rest of a JSON string literal (honouring backslash escapes)
+_JSON_TOKEN = re.compile(r'[{}"]')
+_STRING_TAIL = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+# Precompiled fallbacks for whitespace/case variants of the "json" marker that
+# the str.find fast path in _extract_chart_json_from_cleaned misses
+_JSON_START_PATTERNS = [
+    re.compile(r'json\s*\n\s*\{', re.IGNORECASE | re.MULTILINE),  # "json" followed by newline and opening brace
+    re.compile(r'```json\s*\n\s*\{', re.IGNORECASE | re.MULTILINE),  # markdown json block
+]
+_ANALYSIS_PATTERNS = [
+    re.compile(r'json\s*\n\s*\{', re.IGNORECASE | re.MULTILINE),  # "json" followed by newline and opening brace
+    re.compile(r'```json\s*\n\s*\{', re.IGNORECASE | re.MULTILINE),  # markdown json block
+    re.compile(r'\{(?=\s*"title")', re.IGNORECASE | re.MULTILINE),  # opening brace followed by "title" field
+]
+# Chart type keywords in priority order: explicit chart names first, then
+# weaker data-shape hints. Substring matches, so 'pie' also covers 'pie chart'.
+_CHART_TYPE_KEYWORDS = (
+    ('pie', ('pie',)),
+    ('line', ('line chart', 'line graph', 'trend', 'over time', 'time series')),
+    ('scatter', ('scatter plot', 'correlation', 'relationship', 'vs', 'versus')),
+    ('bar', ('bar chart', 'bar graph', 'comparison', 'compare')),
+    ('pie', ('share', 'distribution', 'percentage', 'proportion')),
+    ('line', ('growth', 'change', 'monthly', 'yearly', 'daily')),
+)
+
+# Chart configuration used when the API response doesn't provide one
+_DEFAULT_CHART_CONFIG = MappingProxyType({
+    'x_axis_title': 'Categories',
+    'y_axis_title': 'Values',
+    'color_scheme': 'viridis',
+    'show_legend': True,
+    'responsive': True
+})
+
+# Markers of placeholder analysis text (the first alternative is covered by
+# 'huge string' but kept to mirror the known response shape)
+_PLACEHOLDER_RE = re.compile(r'…huge string……\.\.\.|huge string|\.\.\.|placeholder|sample text', re.IGNORECASE)
+
+# Analysis shown when the model only returned placeholder text
+_FALLBACK_ANALYSIS = """**AI Analysis Summary:**
+
+This chart was generated based on your request. The AI model analyzed the data requirements and created an appropriate visualization with the following considerations:
+
+• **Data Structure**: The chart includes properly formatted labels and datasets
+• **Visualization Type**: Selected based on the nature of your data and request
+• **Configuration**: Optimized chart settings for clarity and readability
+• **Interactivity**: Generated as an interactive HTML chart for better user experience
+
+The model processed your request and generated realistic sample data that demonstrates the patterns and relationships you requested."""
+
+_MD_FENCE_HEAD = re.compile(r'^```.*?\n', re.MULTILINE)
+_MD_FENCE_TAIL = re.compile(r'\n```$')
+_MULTI_NL = re.compile(r'\n\s*\n\s*\n')
+
+# Non-breaking space and the U+2000..U+200A space family, mapped to a plain space
+_UNICODE_SPACE_TABLE = str.maketrans({c: ' ' for c in '\xa0\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'})
+
+
+def _preview(value: Any, limit: int) -> str:
+    """Short text preview of a response, only built when actually reported"""
+    text = value if isinstance(value, str) else str(value)
+    return text[:limit]
+
+
+def _clean_prediction(content: str) -> str:
+    """Strip wrapper quotes, unescape newlines/quotes and normalize Unicode spaces"""
+    
+    if content.startswith('"""') and content.endswith('"'):
+        content = content[3:-1]  # Remove triple quotes at start and quote at end
+    
+    # Handle escaped newlines and quotes
+    content = content.replace('\\n', '\n').replace('\\"', '"')
+    
+    return content.translate(_UNICODE_SPACE_TABLE)
+
+
+def _is_chart_data(parsed: Any) -> bool:
+    """True if parsed JSON has every required chart field: title, chart_type and data"""
+    return (isinstance(parsed, dict)
+            and 'title' in parsed
+            and 'chart_type' in parsed
+            and 'data' in parsed)
+
+
+def _mentions_chart_fields(text: str) -> bool:
+    """Cheap substring prefilter: could this JSON text be chart data at all?"""
+    return '"title"' in text and '"chart_type"' in text and '"data"' in text
+
+
+def _load_chart_json(content: Union[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Parse content as chart JSON directly, or return None if it is anything else"""
+    
+    if isinstance(content, dict):
+        parsed = content
+    else:
+        try:
+            parsed = _loads(content)
+        except _JSONError:
+            return None
+    
+    if _is_chart_data(parsed):
+        return parsed
+    return None
+
+
+def _materialize(value: Any) -> Any:
+    """Convert a lazy simdjson value into plain Python objects"""
+    
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _decode_body(response: Any) -> Any:
+    """Parse a JSON response body straight from bytes, falling back to text"""
+    
+    content = response.content
+    
+    if simdjson is not None:
+        # Lazy parse: for the usual envelope only the prediction field is
+        # materialized, the transaction/response metadata never becomes objects
+        try:
+            document = simdjson.Parser().parse(content)
+        except ValueError:
+            return response.text
+        
+        if isinstance(document, simdjson.Object) and 'prediction' in document:
+            return {'prediction': _materialize(document['prediction'])}
+        return _materialize(document)
+    
+    try:
+        return _loads(content)
+    except _JSONError:
+        return response.text
+
+
+def _iter_object_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) for every top-level brace-balanced {...} span in text
+    
+    Inside an object, string literals are skipped so braces in values like
+    "Q1 {est.}" don't unbalance the count. Quotes outside any object (in the
+    surrounding prose) are ignored. Linear in len(text), no regex backtracking.
+    """
+    
+    depth = 0
+    start = -1
+    pos = 0
+    
+    while True:
+        match = _JSON_TOKEN.search(text, pos)
+        if match is None:
+            return
+        
+        index = match.start()
+        char = text[index]
+        pos = index + 1
+        
+        if char == '"':
+            if depth > 0:
+                tail = _STRING_TAIL.match(text, pos)
+                if tail is None:
+                    return  # Unterminated string - no complete object can follow
+                pos = tail.end()
+        elif char == '{':
+            if depth == 0:
+                start = index
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield start, pos
+
+
+def _iter_balanced_objects(text: str) -> Iterator[str]:
+    """Yield every top-level brace-balanced {...} span in text"""
+    
+    for start, end in _iter_object_spans(text):
+        yield text[start:end]
+
+
+def _find_object_end(text: str) -> int:
+    """Index just past the brace closing the first object in text, or -1"""
+    
+    return next((end for _, end in _iter_object_spans(text)), -1)
+
+
+def _build_chart_type_table() -> Tuple[Dict[str, Tuple[int, str]], "re.Pattern[str]"]:
+    """Map each keyword to its (priority, chart_type) and compile one pattern for all of them"""
+    
+    table: Dict[str, Tuple[int, str]] = {}
+    for priority, (chart_type, keywords) in enumerate(_CHART_TYPE_KEYWORDS):
+        for keyword in keywords:
+            table.setdefault(keyword, (priority, chart_type))  # Keep the higher-priority group
+    
+    # The lookahead reports every occurrence, including overlapping ones
+    pattern = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in table) + '))')
+    return table, pattern
+
+
+# Pure-Python fallback when neither Hyperscan nor pyahocorasick is installed
+_CHART_TYPE_TABLE, _CHART_TYPE_PATTERN = _build_chart_type_table()
+
+
+def _build_chart_type_automaton():
+    """Compile every chart type keyword into one Aho-Corasick automaton"""
+    
+    automaton = ahocorasick.Automaton()
+    for priority, (chart_type, keywords) in enumerate(_CHART_TYPE_KEYWORDS):
+        for keyword in keywords:
+            if keyword not in automaton:  # Keep the higher-priority group
+                automaton.add_word(keyword, (priority, chart_type))
+    automaton.make_automaton()
+    return automaton
+
+
+_CHART_TYPE_AUTOMATON = _build_chart_type_automaton() if ahocorasick is not None else None
+
+
+def _build_chart_type_database():
+    """Compile every chart type keyword into one case-insensitive Hyperscan database"""
+    
+    hits = tuple((priority, chart_type)
+                 for priority, (chart_type, keywords) in enumerate(_CHART_TYPE_KEYWORDS)
+                 for _ in keywords)
+    expressions = [re.escape(keyword).encode('utf-8')
+                   for _, keywords in _CHART_TYPE_KEYWORDS
+                   for keyword in keywords]
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+    )
+    return database, hits
+
+
+_CHART_TYPE_DATABASE = _build_chart_type_database() if hyperscan is not None else None
+# The database's scratch space is not safe to share between concurrent scans
+_CHART_TYPE_DATABASE_LOCK = threading.Lock()
+
+
+def _scan_chart_type(user_prompt: str) -> Optional[Tuple[int, str]]:
+    """Return the highest-priority (priority, chart_type) keyword hit via Hyperscan"""
+    
+    database, hits = _CHART_TYPE_DATABASE
+    matches = []
+    
+    def on_match(pattern_id, start, end, flags, context):
+        matches.append(hits[pattern_id])
+    
+    with _CHART_TYPE_DATABASE_LOCK:
+        database.scan(user_prompt.encode('utf-8'), match_event_handler=on_match)
+    return min(matches, default=None)
+
+
+def _match_chart_type_table(prompt_lower: str) -> Optional[Tuple[int, str]]:
+    """Return the highest-priority (priority, chart_type) keyword hit via the regex table"""
+    
+    return min((_CHART_TYPE_TABLE[match.group(1)]
+                for match in _CHART_TYPE_PATTERN.finditer(prompt_lower)), default=None)
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_chart_type(user_prompt: str, explicit_chart_type: Optional[str] = None) -> str:
+    """Detect chart type from user prompt or explicit type (pure, so memoized)"""
+    if explicit_chart_type:
+        return explicit_chart_type
+    
+    # One pass over the prompt, keeping the highest-priority keyword hit
+    if _CHART_TYPE_DATABASE is not None:
+        best_match = _scan_chart_type(user_prompt)
+        return best_match[1] if best_match else 'bar'
+    
+    prompt_lower = user_prompt.lower()
+    
+    if _CHART_TYPE_AUTOMATON is not None:
+        best_match = min((hit for _, hit in _CHART_TYPE_AUTOMATON.iter(prompt_lower)), default=None)
+        return best_match[1] if best_match else 'bar'
+    
+    # Check for specific chart type mentions, then data type hints
+    best_match = _match_chart_type_table(prompt_lower)
+    return best_match[1] if best_match else 'bar'  # Final fallback
 
 
 class APIClient:
     """Client for external API integration"""
     
+    __slots__ = ('config', '_session', '_cache', '_injection_params', '_aclient')
+    
     def __init__(self):
         """Initialize the API client"""
         self.config = get_config()
         
+        # Persistent session so repeated calls reuse the keep-alive connection;
+        # transient failures are retried by urllib3 on the same pooled socket
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(10, self.config.max_concurrency),
+            max_retries=Retry(
+                total=self.config.max_retries,
+                connect=3,
+                # A read timeout means the server may still be generating; re-sending
+                # the POST would wait another READ_TIMEOUT and bill a duplicate generation
+                read=0,
+                backoff_factor=self.config.retry_backoff,
+                status_forcelist=_RETRY_STATUSES,
+                allowed_methods=frozenset(['HEAD', 'POST'])
+            )
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Optionally pay DNS + TCP/TLS setup now instead of on the first real request
+        if self.config.prewarm:
+            try:
+                self._session.head(self.config.api_url, timeout=self.config.connect_timeout)
+            except requests.exceptions.RequestException:
+                pass
+        
+        self._cache = ResponseCache(self.config.cache_dir, ttl=self.config.cache_ttl)
+        
+        # Sampling parameters are fixed for the client's lifetime; stringify them once
+        self._injection_params = {
+            "temperature": str(self.config.temperature),
+            "topk": str(self.config.top_k),
+            "token": str(self.config.max_tokens)
+        }
+        
+        # httpx.AsyncClient for the async API, created on first use
+        self._aclient = None
+        
+        # Parser diagnostics go through the module logger; surface them in debug mode
+        if self.config.debug and not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+            logger.setLevel(logging.DEBUG)
+        
         if self.config.verbose:
             print(f"✅ API client initialized with URL: {self.config.api_url}")
     
-    def generate_data_and_chart(self, user_prompt: str, chart_type: Optional[str] = None) -> Dict[str, Any]:
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self._session.close()
+    
+    def __enter__(self) -> "APIClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def generate_data_and_chart(self, user_prompt: str, chart_type: Optional[str] = None,
+                                bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Generate data and chart instructions based on user prompt
         
         Args:
             user_prompt: User's request for data visualization
             chart_type: Optional specific chart type (bar, line, pie, scatter)
+            bypass_cache: Skip cached results and always call the API
         
         Returns:
             Dictionary containing data, chart configuration, and metadata
         """
         try:
+            # Resolve the chart type once; parsing and fallbacks reuse it as explicit
+            chart_type = self._detect_chart_type_from_prompt(user_prompt, chart_type)
+            
             # Create the payload according to the specified structure
             payload = self._create_payload(user_prompt, chart_type)
+            body = _canonical(payload)
+            cache_key = self._chart_cache_key(body, chart_type)
+            
+            # Reuse the already parsed chart for an identical request
+            cached_chart = self._get_cached_chart(cache_key, bypass_cache)
+            if cached_chart is not None:
+                return cached_chart
             
             # TEMPORARY: Use mock request for testing - change back to self._make_request(payload) when ready
             # response = self.make_mock_request(payload)
-            response = self._make_request(payload)
+            response = self._make_request(payload, bypass_cache=bypass_cache, body=body)
+            
+            return self._finish_chart(response, user_prompt, chart_type, cache_key, body)
+            
+        except Exception as e:
+            raise self._generation_error(e)
+    
+    async def agenerate_data_and_chart(self, user_prompt: str, chart_type: Optional[str] = None,
+                                       bypass_cache: bool = False) -> Dict[str, Any]:
+        """
+        Async variant of generate_data_and_chart built on a pooled httpx.AsyncClient
+        
+        Args:
+            user_prompt: User's request for data visualization
+            chart_type: Optional specific chart type (bar, line, pie, scatter)
+            bypass_cache: Skip cached results and always call the API
+        
+        Returns:
+            Dictionary containing data, chart configuration, and metadata
+        """
+        try:
+            chart_type = self._detect_chart_type_from_prompt(user_prompt, chart_type)
             
-            # Parse the response
-            parsed_response = self._parse_response(response, user_prompt, chart_type)
+            payload = self._create_payload(user_prompt, chart_type)
+            body = _canonical(payload)
+            cache_key = self._chart_cache_key(body, chart_type)
             
-            # Add metadata
-            parsed_response['original_prompt'] = user_prompt
-            parsed_response['api_url'] = self.config.api_url
+            cached_chart = self._get_cached_chart(cache_key, bypass_cache)
+            if cached_chart is not None:
+                return cached_chart
             
-            return parsed_response
+            response = await self._amake_request(payload, bypass_cache=bypass_cache, body=body)
+            
+            return self._finish_chart(response, user_prompt, chart_type, cache_key, body)
             
         except Exception as e:
-            if self.config.debug:
-                print(f"❌ Error generating content: {str(e)}")
-            
-            # Provide more specific error messages
-            error_msg = str(e)
-            if "API request failed" in error_msg:
-                raise Exception(f"❌ **API Connection Error**\n\n{error_msg}\n\n💡 **Please check:**\n- Your API_URL is correct\n- The API endpoint is accessible\n- Your internet connection")
-            elif "Failed to parse" in error_msg:
-                raise Exception(f"❌ **API Response Error**\n\n{error_msg}\n\n💡 **The API returned an unexpected response format**")
-            else:
-                raise Exception(f"❌ **Chart Generation Error**\n\n{error_msg}")
+            raise self._generation_error(e)
+    
+    async def agenerate_many(self, prompts: List[str], chart_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Generate charts for several prompts concurrently over the shared connection pool"""
+        return await asyncio.gather(*(self.agenerate_data_and_chart(prompt, chart_type) for prompt in prompts))
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was created"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
+    def clear_cache(self) -> None:
+        """Drop all cached responses and charts, in memory and on disk"""
+        self._cache.clear()
+        _detect_chart_type.cache_clear()
+    
+    def _get_cached_chart(self, cache_key: str, bypass_cache: bool) -> Optional[Dict[str, Any]]:
+        """Return previously parsed chart data for this request, if any"""
+        
+        if bypass_cache:
+            return None
+        
+        cached_chart = self._cache.get('charts', cache_key)
+        if cached_chart is not None and self.config.debug:
+            print("💾 Using cached chart data")
+        return cached_chart
+    
+    def _finish_chart(self, response: Any, user_prompt: str, chart_type: Optional[str], cache_key: str,
+                      body: bytes) -> Dict[str, Any]:
+        """Parse the API response, attach metadata and cache the result"""
+        
+        # Parse the response
+        parsed_response = self._parse_response(response, user_prompt, chart_type)
+        
+        # Add metadata
+        parsed_response['original_prompt'] = user_prompt
+        parsed_response['api_url'] = self.config.api_url
+        
+        # Neither the raw reply nor the chart is cached for a fallback response,
+        # so retrying the prompt asks the model again
+        if not parsed_response.get('parsing_error'):
+            self._cache.set('responses', self._cache_key(body), response)
+            self._cache.set('charts', cache_key, parsed_response)
+        
+        return parsed_response
+    
+    def _generation_error(self, e: Exception) -> Exception:
+        """Wrap a generation failure in a user-facing error message"""
+        
+        if self.config.debug:
+            print(f"❌ Error generating content: {str(e)}")
+        
+        # Provide more specific error messages
+        error_msg = str(e)
+        if "API request failed" in error_msg:
+            return Exception(f"❌ **API Connection Error**\n\n{error_msg}\n\n💡 **Please check:**\n- Your API_URL is correct\n- The API endpoint is accessible\n- Your internet connection")
+        elif "Failed to parse" in error_msg:
+            return Exception(f"❌ **API Response Error**\n\n{error_msg}\n\n💡 **The API returned an unexpected response format**")
+        else:
+            return Exception(f"❌ **Chart Generation Error**\n\n{error_msg}")
     
     def _create_payload(self, user_prompt: str, chart_type: Optional[str] = None) -> Dict[str, Any]:
         """Create the payload structure as specified"""
         
+        # Only the prompt varies; the sampling parameters are shared, read-only
         payload = {
             "PROJECT": "Chart Generator",
             "CONTEXT": "Generate interactive chart data based on user request",
             "INJECTION": {
                 "INPUT": user_prompt
             },
-            "injection": {
-                "temperature": str(self.config.temperature),
-                "topk": str(self.config.top_k),
-                "token": str(self.config.max_tokens)
-            }
+            "injection": self._injection_params
         }
         
         return payload
     
-    def _make_request(self, payload: Dict[str, Any]) -> str:
-        """Make POST request to the API endpoint"""
+    def _cache_key(self, body: bytes) -> str:
+        """Hash the endpoint and encoded request body into a cache key"""
+        return ResponseCache.make_key(self.config.api_url.encode('utf-8'), body)
+    
+    def _chart_cache_key(self, body: bytes, chart_type: str) -> str:
+        """Cache key for a parsed chart; the chart type is not part of the payload,
+        but it decides the type of charts whose reply leaves it unset"""
+        return ResponseCache.make_key(self.config.api_url.encode('utf-8'), body, chart_type.encode('utf-8'))
+    
+    def _make_request(self, payload: Dict[str, Any], bypass_cache: bool = False,
+                      body: Optional[bytes] = None) -> str:
+        """Make POST request to the API endpoint, serving cached replies that parsed earlier"""
+        
+        # The canonical bytes are both the request body and the cache key input
+        if body is None:
+            body = _canonical(payload)
+        cache_key = self._cache_key(body)
+        cached_response = self._get_cached_response(cache_key, bypass_cache)
+        if cached_response is not None:
+            return cached_response
         
         try:
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            }
-            
-            response = requests.post(
+            response = self._session.post(
                 self.config.api_url,
-                json=payload,
-                headers=headers,
-                timeout=180
+                data=body,
+                timeout=(self.config.connect_timeout, self.config.read_timeout)
             )
             
             response.raise_for_status()
-            
-            # Try to get JSON response, fallback to text
-            try:
-                return response.json()
-            except json.JSONDecodeError:
-                return response.text
+            result = _decode_body(response)
                 
         except requests.exceptions.RequestException as e:
             raise Exception(f"API request failed: {str(e)}")
+        
+        # Stored by _finish_chart once the reply is known to parse
+        return result
+    
+    async def _amake_request(self, payload: Dict[str, Any], bypass_cache: bool = False,
+                             body: Optional[bytes] = None) -> str:
+        """Async counterpart of _make_request using the shared httpx.AsyncClient"""
+        
+        import httpx
+        
+        if body is None:
+            body = _canonical(payload)
+        cache_key = self._cache_key(body)
+        cached_response = self._get_cached_response(cache_key, bypass_cache)
+        if cached_response is not None:
+            return cached_response
+        
+        try:
+            # The httpx transport only retries failed connections; retry 429/5xx
+            # replies here with the same backoff as the synchronous session
+            client = self._get_async_client()
+            for attempt in range(self.config.max_retries + 1):
+                response = await client.post(
+                    self.config.api_url,
+                    content=body
+                )
+                if response.status_code not in _RETRY_STATUSES or attempt == self.config.max_retries:
+                    break
+                await asyncio.sleep(self._retry_delay(attempt, response))
+            
+            response.raise_for_status()
+            result = _decode_body(response)
+            
+        except httpx.HTTPError as e:
+            raise Exception(f"API request failed: {str(e)}")
+        
+        # Stored by _finish_chart once the reply is known to parse
+        return result
+    
+    def _retry_delay(self, attempt: int, response: Any) -> float:
+        """Seconds to wait before retry number attempt + 1, matching urllib3's Retry:
+        a numeric Retry-After header wins, otherwise backoff doubles from the second retry"""
+        
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return float(retry_after)
+        if attempt == 0:
+            return 0.0
+        return min(120.0, self.config.retry_backoff * (2 ** attempt))
+    
+    def _get_cached_response(self, cache_key: str, bypass_cache: bool) -> Optional[Any]:
+        """Return a stored raw API response for this request, if any"""
+        
+        if bypass_cache:
+            return None
+        
+        cached_response = self._cache.get('responses', cache_key)
+        if cached_response is not None and self.config.debug:
+            print("💾 Using cached API response")
+        return cached_response
+    
+    def _get_async_client(self):
+        """Lazily build the pooled httpx.AsyncClient (HTTP/2 when h2 is installed)"""
+        
+        if self._aclient is None:
+            import httpx
+            
+            http2 = importlib.util.find_spec('h2') is not None
+            limits = httpx.Limits(
+                max_connections=self.config.max_concurrency,
+                max_keepalive_connections=min(16, self.config.max_concurrency)
+            )
+            self._aclient = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout),
+                transport=httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=self.config.max_retries),
+                headers=dict(self._session.headers)
+            )
+        
+        return self._aclient
     
     def make_mock_request(self, payload: Dict[str, Any]) -> str:
         """Load mock response from response.json for testing"""
@@ -127,6 +697,7 @@ class APIClient:
         """Parse API response and extract structured data from prediction field"""
         
         prediction_content = None
+        cleaned_content = None
         chart_data = None
         
         try:
@@ -136,18 +707,24 @@ class APIClient:
             if not prediction_content:
                 raise Exception("No prediction content found in API response")
             
-            # Extract JSON from the prediction content
-            chart_data = self._extract_chart_json_from_prediction(prediction_content)
+            # Fast path: the prediction is nothing but the chart JSON itself
+            chart_data = _load_chart_json(prediction_content)
             
+            if chart_data is None:
+                # An incomplete dict still goes through the text extractors
+                if isinstance(prediction_content, dict):
+                    prediction_content = _dumps(prediction_content)
+                
+                # Clean up the prediction content once for both extractors
+                cleaned_content = _clean_prediction(prediction_content)
+                
+                # Extract JSON from the prediction content
+                chart_data = self._extract_chart_json_from_cleaned(cleaned_content)
+            
+            # Required fields were already validated by _load_chart_json or _try_parse_json_candidate
             if not chart_data:
                 raise Exception("No valid chart JSON found in prediction content")
             
-            # Validate required fields
-            required_fields = ['title', 'chart_type', 'data']
-            for field in required_fields:
-                if field not in chart_data:
-                    raise ValueError(f"Missing required field: {field}")
-            
             # Set defaults for optional fields
             if 'description' not in chart_data:
                 chart_data['description'] = "Generated data visualization"
@@ -160,8 +737,8 @@ class APIClient:
                 chart_data['chart_type'] = self._detect_chart_type_from_prompt(user_prompt, chart_type)
             
             # Always try to extract analysis text if we have prediction content
-            if prediction_content:
-                analysis_text = self._extract_analysis_text_from_prediction(prediction_content)
+            if cleaned_content:
+                analysis_text = self._extract_analysis_text_from_cleaned(cleaned_content)
                 if analysis_text:
                     chart_data['prediction_analysis'] = analysis_text
             
@@ -169,35 +746,34 @@ class APIClient:
                 
         except json.JSONDecodeError as e:
             error_msg = f"Failed to parse chart JSON from prediction: {e}"
-            if self.config.debug:
-                print(f"❌ JSON parsing error: {e}")
-                print(f"Response: {str(response)[:500]}...")
+            logger.debug("❌ JSON parsing error: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response: %s...", _preview(response, 500))
             
             # Try to return analysis-only fallback
-            fallback_data = self._create_fallback_response(prediction_content, user_prompt, chart_type, "JSON parsing failed")
+            fallback_data = self._create_fallback_response(cleaned_content, user_prompt, chart_type, "JSON parsing failed")
             if fallback_data:
                 return fallback_data
             
-            raise Exception(f"{error_msg}\n\nAPI Response: {str(response)[:200]}...")
+            raise Exception(f"{error_msg}\n\nAPI Response: {_preview(response, 200)}...")
         
         except Exception as e:
-            if self.config.debug:
-                print(f"❌ Response parsing error: {e}")
+            logger.debug("❌ Response parsing error: %s", e)
             
             # Try to return analysis-only fallback for any other error
-            fallback_data = self._create_fallback_response(prediction_content, user_prompt, chart_type, "Chart parsing failed")
+            fallback_data = self._create_fallback_response(cleaned_content, user_prompt, chart_type, "Chart parsing failed")
             if fallback_data:
                 return fallback_data
             
             raise Exception(f"Failed to parse API response: {str(e)}")
     
-    def _create_fallback_response(self, prediction_content: Optional[str], user_prompt: str, chart_type: Optional[str], error_reason: str) -> Optional[Dict[str, Any]]:
+    def _create_fallback_response(self, cleaned_content: Optional[str], user_prompt: str, chart_type: Optional[str], error_reason: str) -> Optional[Dict[str, Any]]:
         """Create a fallback response when chart parsing fails but analysis is available"""
         
-        if not prediction_content:
+        if not cleaned_content:
             return None
         
-        analysis_text = self._extract_analysis_text_from_prediction(prediction_content)
+        analysis_text = self._extract_analysis_text_from_cleaned(cleaned_content)
         if not analysis_text:
             return None
         
@@ -212,219 +788,165 @@ class APIClient:
             'error_reason': error_reason
         }
         
-        if self.config.debug:
-            print(f"✅ Created fallback response with analysis ({len(analysis_text)} chars)")
+        logger.debug("✅ Created fallback response with analysis (%d chars)", len(analysis_text))
         
         return fallback_data
     
-    def _extract_prediction_content(self, response: Any) -> Optional[str]:
-        """Extract prediction content from API response"""
+    def _extract_prediction_content(self, response: Any) -> Optional[Union[str, Dict[str, Any]]]:
+        """Extract prediction content from API response (a dict when it already is chart data)"""
         
         try:
+            # Raw bodies are parsed straight from bytes; str() would give their repr
+            if isinstance(response, (bytes, bytearray)):
+                try:
+                    response = _loads(response)
+                except _JSONError:
+                    response = response.decode('utf-8', errors='replace')
+            
             # Handle different response formats
             if isinstance(response, dict):
                 # Check for prediction field directly
                 if 'prediction' in response:
                     return response['prediction']
                 
-                # If response is already the prediction content
+                # If response is already the chart data, hand the dict over as-is
                 if 'title' in response and 'chart_type' in response:
-                    return json.dumps(response)
+                    return response
                 
-                # Convert dict to JSON string for further processing
-                response_text = json.dumps(response)
-            elif isinstance(response, str):
-                response_text = response
-            else:
-                response_text = str(response)
+                # No prediction field to find - serialize once for the text extractors
+                return _dumps(response)
+            
+            response_text = response if isinstance(response, str) else str(response)
             
             # Try to find prediction field in JSON response
             try:
-                parsed_response = json.loads(response_text)
-                if isinstance(parsed_response, dict) and 'prediction' in parsed_response:
-                    return parsed_response['prediction']
-            except json.JSONDecodeError:
+                parsed_response = _loads(response_text)
+                if isinstance(parsed_response, dict):
+                    if 'prediction' in parsed_response:
+                        return parsed_response['prediction']
+                    # Already chart data - keep the parsed dict rather than reparsing the text
+                    if _is_chart_data(parsed_response):
+                        return parsed_response
+            except _JSONError:
                 pass
             
             # If no prediction field found, return the original response
             return response_text
             
         except Exception as e:
-            if self.config.debug:
-                print(f"❌ Error extracting prediction content: {e}")
+            logger.debug("❌ Error extracting prediction content: %s", e)
             return None
     
-    def _extract_chart_json_from_prediction(self, prediction_content: str) -> Optional[Dict[str, Any]]:
-        """Extract chart configuration JSON from prediction content"""
+    def _extract_chart_json_from_cleaned(self, cleaned_content: str) -> Optional[Dict[str, Any]]:
+        """Extract chart configuration JSON from prediction content already run through _clean_prediction"""
         
         try:
-            if self.config.debug:
-                print(f"🔍 Extracting JSON from prediction content ({len(prediction_content)} chars)")
-            
-            # Clean up the prediction content - remove escape sequences and extra quotes
-            cleaned_content = prediction_content
-            if cleaned_content.startswith('"""') and cleaned_content.endswith('"'):
-                cleaned_content = cleaned_content[3:-1]  # Remove triple quotes at start and quote at end
-            
-            # Handle escaped newlines and quotes
-            cleaned_content = cleaned_content.replace('\\n', '\n').replace('\\"', '"')
-            
-            # Remove non-breaking spaces and other problematic Unicode characters
-            cleaned_content = cleaned_content.replace('\xa0', ' ')  # Non-breaking space to regular space
-            cleaned_content = cleaned_content.replace('\u2000', ' ')  # En quad
-            cleaned_content = cleaned_content.replace('\u2001', ' ')  # Em quad
-            cleaned_content = cleaned_content.replace('\u2002', ' ')  # En space
-            cleaned_content = cleaned_content.replace('\u2003', ' ')  # Em space
-            cleaned_content = cleaned_content.replace('\u2004', ' ')  # Three-per-em space
-            cleaned_content = cleaned_content.replace('\u2005', ' ')  # Four-per-em space
-            cleaned_content = cleaned_content.replace('\u2006', ' ')  # Six-per-em space
-            cleaned_content = cleaned_content.replace('\u2007', ' ')  # Figure space
-            cleaned_content = cleaned_content.replace('\u2008', ' ')  # Punctuation space
-            cleaned_content = cleaned_content.replace('\u2009', ' ')  # Thin space
-            cleaned_content = cleaned_content.replace('\u200a', ' ')  # Hair space
+            logger.debug("🔍 Extracting JSON from prediction content (%d chars)", len(cleaned_content))
             
-            if self.config.debug:
-                print(f"📝 Cleaned content preview: {cleaned_content[:200]}...")
+            logger.debug("📝 Cleaned content preview: %.200s...", cleaned_content)
+            
+            # Fast path: the object right after a "json" marker, or the first object at all
+            marker = cleaned_content.find('```json')
+            if marker < 0:
+                marker = cleaned_content.find('\njson\n')
+            json_start = cleaned_content.find('{', max(marker, 0))
             
-            # Look for JSON after "json" keyword (common pattern in the response)
-            json_start_patterns = [
-                r'json\s*\n\s*\{',  # "json" followed by newline and opening brace
-                r'```json\s*\n\s*\{',  # markdown json block
-                r'\{',  # Just look for opening brace
-            ]
+            if json_start >= 0:
+                parsed_json = self._try_json_start(cleaned_content, json_start)
+                if parsed_json:
+                    return parsed_json
             
-            for pattern in json_start_patterns:
-                match = re.search(pattern, cleaned_content, re.IGNORECASE | re.MULTILINE)
+            # Look for JSON after "json" keyword variants the fast path missed
+            for pattern in _JSON_START_PATTERNS:
+                match = pattern.search(cleaned_content)
                 if match:
                     # Find the start of the JSON (the opening brace)
-                    json_start = match.end() - 1 if pattern != r'\{' else match.start()
-                    
-                    # Extract everything from the opening brace onwards
-                    json_candidate = cleaned_content[json_start:].strip()
-                    
-                    if self.config.debug:
-                        print(f"🎯 Found JSON candidate starting at position {json_start}")
-                        print(f"📄 JSON candidate preview: {json_candidate[:200]}...")
-                    
-                    # Try to parse this as JSON
-                    parsed_json = self._try_parse_json_candidate(json_candidate)
+                    parsed_json = self._try_json_start(cleaned_content, match.end() - 1)
                     if parsed_json:
                         return parsed_json
             
             # Fallback: try to find any JSON-like structure
-            if self.config.debug:
-                print("🔄 Trying fallback JSON extraction methods...")
+            logger.debug("🔄 Trying fallback JSON extraction methods...")
             
             # Look for balanced braces
-            brace_count = 0
-            json_start = -1
-            
-            for i, char in enumerate(cleaned_content):
-                if char == '{':
-                    if json_start == -1:
-                        json_start = i
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0 and json_start != -1:
-                        # Found a complete JSON object
-                        json_candidate = cleaned_content[json_start:i+1]
-                        parsed_json = self._try_parse_json_candidate(json_candidate)
-                        if parsed_json:
-                            return parsed_json
-                        # Reset for next potential JSON object
-                        json_start = -1
+            for json_candidate in _iter_balanced_objects(cleaned_content):
+                parsed_json = self._try_parse_json_candidate(json_candidate)
+                if parsed_json:
+                    return parsed_json
             
             return None
             
         except Exception as e:
-            if self.config.debug:
-                print(f"❌ Error extracting chart JSON: {e}")
+            logger.debug("❌ Error extracting chart JSON: %s", e)
             return None
     
+    def _try_json_start(self, cleaned_content: str, json_start: int) -> Optional[Dict[str, Any]]:
+        """Try to parse the chart JSON beginning at the given opening brace"""
+        
+        # Extract everything from the opening brace onwards
+        json_candidate = cleaned_content[json_start:].strip()
+        
+        logger.debug("🎯 Found JSON candidate starting at position %d", json_start)
+        logger.debug("📄 JSON candidate preview: %.200s...", json_candidate)
+        
+        return self._try_parse_json_candidate(json_candidate)
+    
     def _try_parse_json_candidate(self, json_candidate: str) -> Optional[Dict[str, Any]]:
-        """Try to parse a JSON candidate string and validate it's chart data"""
+        """
+        Try to parse a JSON candidate string and validate it's chart data
+        
+        This is the single place the required chart fields are checked: any
+        dict returned here is guaranteed to have title, chart_type and data.
+        """
         
         try:
             # Remove any trailing non-JSON content
             json_candidate = json_candidate.strip()
             
             # Find the end of the JSON object
-            brace_count = 0
-            json_end = -1
-            
-            for i, char in enumerate(json_candidate):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        json_end = i + 1
-                        break
+            json_end = _find_object_end(json_candidate)
             
             if json_end > 0:
                 json_str = json_candidate[:json_end]
             else:
                 json_str = json_candidate
             
-            if self.config.debug:
-                print(f"🧪 Trying to parse JSON: {json_str[:100]}...")
+            # Cheap substring prefilter: skip the full parse for objects that
+            # cannot be chart data
+            if not _mentions_chart_fields(json_str):
+                logger.debug("❌ JSON candidate doesn't mention required chart fields")
+                return None
             
-            parsed_json = json.loads(json_str)
+            logger.debug("🧪 Trying to parse JSON: %.100s...", json_str)
+            
+            parsed_json = _loads(json_str)
             
             # Validate this is chart data
-            if (isinstance(parsed_json, dict) and 
-                'title' in parsed_json and 
-                'chart_type' in parsed_json and 
-                'data' in parsed_json):
+            if _is_chart_data(parsed_json):
                 
-                if self.config.debug:
-                    print(f"✅ Found valid chart JSON with title: {parsed_json.get('title', 'N/A')}")
+                logger.debug("✅ Found valid chart JSON with title: %s", parsed_json.get('title', 'N/A'))
                 
                 return parsed_json
             else:
-                if self.config.debug:
-                    print(f"❌ JSON object doesn't have required chart fields")
+                logger.debug("❌ JSON object doesn't have required chart fields")
                 return None
                 
-        except json.JSONDecodeError as e:
-            if self.config.debug:
-                print(f"❌ JSON decode error: {e}")
+        except _JSONError as e:
+            logger.debug("❌ JSON decode error: %s", e)
             return None
         except Exception as e:
-            if self.config.debug:
-                print(f"❌ Error parsing JSON candidate: {e}")
+            logger.debug("❌ Error parsing JSON candidate: %s", e)
             return None
     
-    def _extract_analysis_text_from_prediction(self, prediction_content: str) -> Optional[str]:
-        """Extract the analysis text from prediction content (everything before the JSON)"""
+    def _extract_analysis_text_from_cleaned(self, cleaned_content: str) -> Optional[str]:
+        """Extract the analysis text (everything before the JSON) from cleaned prediction content"""
         
         try:
-            # Clean up the prediction content
-            cleaned_content = prediction_content
-            if cleaned_content.startswith('"""') and cleaned_content.endswith('"'):
-                cleaned_content = cleaned_content[3:-1]
-            
-            # Handle escaped newlines and quotes
-            cleaned_content = cleaned_content.replace('\\n', '\n').replace('\\"', '"')
-            
-            # Remove non-breaking spaces and other problematic Unicode characters
-            cleaned_content = cleaned_content.replace('\xa0', ' ')
-            for unicode_char in ['\u2000', '\u2001', '\u2002', '\u2003', '\u2004', 
-                               '\u2005', '\u2006', '\u2007', '\u2008', '\u2009', '\u200a']:
-                cleaned_content = cleaned_content.replace(unicode_char, ' ')
-            
             # Find where the JSON starts
-            json_patterns = [
-                r'json\s*\n\s*\{',  # "json" followed by newline and opening brace
-                r'```json\s*\n\s*\{',  # markdown json block
-                r'\{(?=\s*"title")',  # opening brace followed by "title" field
-            ]
-            
             json_start_pos = len(cleaned_content)  # Default to end if no JSON found
             
-            for pattern in json_patterns:
-                match = re.search(pattern, cleaned_content, re.IGNORECASE | re.MULTILINE)
+            for pattern in _ANALYSIS_PATTERNS:
+                match = pattern.search(cleaned_content)
                 if match:
                     json_start_pos = match.start()
                     break
@@ -435,85 +957,38 @@ class APIClient:
             # Clean up the analysis text
             if analysis_text:
                 # Remove any remaining markdown artifacts
-                analysis_text = re.sub(r'^```.*?\n', '', analysis_text, flags=re.MULTILINE)
-                analysis_text = re.sub(r'\n```$', '', analysis_text)
+                analysis_text = _MD_FENCE_HEAD.sub('', analysis_text)
+                analysis_text = _MD_FENCE_TAIL.sub('', analysis_text)
                 
                 # Remove extra whitespace and normalize line breaks
-                analysis_text = re.sub(r'\n\s*\n\s*\n', '\n\n', analysis_text)  # Max 2 consecutive newlines
+                analysis_text = _MULTI_NL.sub('\n\n', analysis_text)  # Max 2 consecutive newlines
                 analysis_text = analysis_text.strip()
                 
-                # Check if this is just placeholder text
-                placeholder_indicators = [
-                    '…huge string……...',
-                    'huge string',
-                    '...',
-                    'placeholder',
-                    'sample text'
-                ]
-                
-                is_placeholder = any(indicator in analysis_text.lower() for indicator in placeholder_indicators)
-                
-                if is_placeholder and len(analysis_text) < 200:
+                # Check if this is just placeholder text (only short texts qualify)
+                if len(analysis_text) < 200 and _PLACEHOLDER_RE.search(analysis_text):
                     # Generate a meaningful fallback message
-                    analysis_text = """**AI Analysis Summary:**
-
-This chart was generated based on your request. The AI model analyzed the data requirements and created an appropriate visualization with the following considerations:
-
-• **Data Structure**: The chart includes properly formatted labels and datasets
-• **Visualization Type**: Selected based on the nature of your data and request
-• **Configuration**: Optimized chart settings for clarity and readability
-• **Interactivity**: Generated as an interactive HTML chart for better user experience
-
-The model processed your request and generated realistic sample data that demonstrates the patterns and relationships you requested."""
+                    analysis_text = _FALLBACK_ANALYSIS
                 
                 if len(analysis_text) > 10:  # Only return if substantial content
-                    if self.config.debug:
-                        print(f"✅ Extracted analysis text ({len(analysis_text)} chars)")
+                    logger.debug("✅ Extracted analysis text (%d chars)", len(analysis_text))
                     return analysis_text
             
             return None
         
         except Exception as e:
-            if self.config.debug:
-                print(f"❌ Error extracting analysis text: {e}")
+            logger.debug("❌ Error extracting analysis text: %s", e)
             return None
     
     def _detect_chart_type_from_prompt(self, user_prompt: str, explicit_chart_type: Optional[str] = None) -> str:
         """Detect chart type from user prompt or explicit type"""
-        if explicit_chart_type:
-            return explicit_chart_type
-        
-        prompt_lower = user_prompt.lower()
-        
-        # Check for specific chart type mentions
-        if 'pie chart' in prompt_lower or 'pie' in prompt_lower:
-            return 'pie'
-        elif any(word in prompt_lower for word in ['line chart', 'line graph', 'trend', 'over time', 'time series']):
-            return 'line'
-        elif any(word in prompt_lower for word in ['scatter plot', 'correlation', 'relationship', 'vs', 'versus']):
-            return 'scatter'
-        elif any(word in prompt_lower for word in ['bar chart', 'bar graph', 'comparison', 'compare']):
-            return 'bar'
-        
-        # Default fallback based on data type hints
-        if any(word in prompt_lower for word in ['share', 'distribution', 'percentage', 'proportion']):
-            return 'pie'
-        elif any(word in prompt_lower for word in ['growth', 'change', 'monthly', 'yearly', 'daily']):
-            return 'line'
-        else:
-            return 'bar'  # Final fallback
+        return _detect_chart_type(user_prompt, explicit_chart_type)
     
     
     def _default_chart_config(self) -> Dict[str, Any]:
         """Return default chart configuration"""
         
-        return {
-            'x_axis_title': 'Categories',
-            'y_axis_title': 'Values',
-            'color_scheme': 'viridis',
-            'show_legend': True,
-            'responsive': True
-        }
+        # A plain dict: it becomes part of the response, which is pickled into the cache
+        return dict(_DEFAULT_CHART_CONFIG)
     
     def test_connection(self) -> bool:
         """Test connection to API endpoint"""
@@ -532,7 +1007,7 @@ The model processed your request and generated realistic sample data that demons
                 }
             }
             
-            response = self._make_request(test_payload)
+            response = self._make_request(test_payload, bypass_cache=True)
             
             if response and "successful" in str(response).lower():
                 if self.config.verbose:
@@ -578,5 +1053,55 @@ def test_api_client():
         return False
 
 
+def test_json_scanner():
+    """Offline checks for the JSON object scanner and chart type detection"""
+    
+    print("🧪 Testing JSON scanner...")
+    
+    try:
+        # Braces and escaped quotes inside strings must not unbalance the count
+        text = 'Here you go: {"title": "Q1 {est.}", "note": "say \\"}\\" twice"} and {"a": {"b": 1}} done'
+        spans = list(_iter_balanced_objects(text))
+        assert spans == ['{"title": "Q1 {est.}", "note": "say \\"}\\" twice"}', '{"a": {"b": 1}}'], spans
+        assert [_loads(span) for span in spans][0]['title'] == 'Q1 {est.}'
+        
+        # Quotes in the surrounding prose are ignored
+        assert list(_iter_balanced_objects('He said "hi" {"x": 1}')) == ['{"x": 1}']
+        
+        # Unbalanced or unterminated input yields nothing past the last complete object
+        assert list(_iter_object_spans('{"x": {"y": 1}')) == []
+        assert list(_iter_balanced_objects('{"x": 1} {"y": "open')) == ['{"x": 1}']
+        assert _find_object_end('no json here') == -1
+        assert _find_object_end('ab{"x": "}"}cd') == len('ab{"x": "}"}')
+        
+        # Whichever matcher is installed must agree with the regex table
+        prompts = [
+            "Create a pie chart of market share",
+            "Show a line graph of revenue trend over time",
+            "scatter plot with a bar overlay",
+            "Monthly sales",
+            "HISTOGRAM of ages",
+            "",
+        ]
+        for prompt in prompts:
+            expected = _match_chart_type_table(prompt.lower())
+            expected_type = expected[1] if expected else 'bar'
+            if _CHART_TYPE_DATABASE is not None:
+                hit = _scan_chart_type(prompt)
+                assert (hit[1] if hit else 'bar') == expected_type, (prompt, hit, expected)
+            if _CHART_TYPE_AUTOMATON is not None:
+                hit = min((hit for _, hit in _CHART_TYPE_AUTOMATON.iter(prompt.lower())), default=None)
+                assert (hit[1] if hit else 'bar') == expected_type, (prompt, hit, expected)
+            assert _detect_chart_type(prompt) == expected_type, prompt
+        
+        print("✅ JSON scanner test successful!")
+        return True
+        
+    except AssertionError as e:
+        print(f"❌ JSON scanner test failed: {e}")
+        return False
+
+
 if __name__ == "__main__":
+    test_json_scanner()
     test_api_client()
@@ -3,7 +3,8 @@ Configuration settings for API Chat Bot Application
 """
 
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Mapping, Optional
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -11,32 +12,60 @@ from pathlib import Path
 load_dotenv()
 
 
+def _flag(value: Optional[str], default: str) -> bool:
+    """Parse a boolean environment value"""
+    return (value or default).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 class Config:
     """Configuration settings for the application"""
     
+    __slots__ = (
+        'api_url', 'temperature', 'top_k', 'max_tokens',
+        'prewarm', 'max_concurrency', 'max_retries', 'retry_backoff',
+        'connect_timeout', 'read_timeout',
+        'output_dir', 'template_dir', 'cache_dir', 'cache_ttl',
+        'debug', 'verbose', '_output_dir_ready',
+    )
+    
     def __init__(self):
+        env: Mapping[str, str] = os.environ
+        
         # API Configuration
         self.api_url: str = self._get_required_env("API_URL")
-        self.temperature: float = float(os.getenv("TEMPERATURE", "0.1"))
-        self.top_k: float = float(os.getenv("TOP_K", "0.1"))
-        self.max_tokens: int = int(os.getenv("MAX_TOKENS", "2048"))
+        self.temperature: float = float(env.get("TEMPERATURE", "0.1"))
+        self.top_k: float = float(env.get("TOP_K", "0.1"))
+        self.max_tokens: int = int(env.get("MAX_TOKENS", "2048"))
+        
+        # Connection Configuration
+        self.prewarm: bool = _flag(env.get("PREWARM"), "false")
+        self.max_concurrency: int = int(env.get("MAX_CONCURRENCY", "20"))
+        self.max_retries: int = int(env.get("MAX_RETRIES", "3"))
+        self.retry_backoff: float = float(env.get("RETRY_BACKOFF", "0.5"))
+        self.connect_timeout: float = float(env.get("CONNECT_TIMEOUT", "5"))
+        self.read_timeout: float = float(env.get("READ_TIMEOUT", "180"))
         
         # Directory Configuration
-        self.output_dir: Path = Path(os.getenv("OUTPUT_DIR", "outputs"))
-        self.template_dir: Path = Path(os.getenv("HTML_TEMPLATE_DIR", "templates"))
+        self.output_dir: Path = Path(env.get("OUTPUT_DIR", "outputs"))
+        self.template_dir: Path = Path(env.get("HTML_TEMPLATE_DIR", "templates"))
+        
+        # Response Cache Configuration
+        self.cache_dir: Path = Path(env.get("CACHE_DIR", ".cache"))
+        self.cache_ttl: int = int(env.get("CACHE_TTL", str(7 * 86400)))
         
         # Application Settings
-        self.debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-        self.verbose: bool = os.getenv("VERBOSE", "true").lower() == "true"
+        self.debug: bool = _flag(env.get("DEBUG"), "false")
+        self.verbose: bool = _flag(env.get("VERBOSE"), "true")
         
-        # Ensure directories exist
-        try:
-            self.output_dir.mkdir(exist_ok=True)
-            self.template_dir.mkdir(exist_ok=True)
-        except (OSError, PermissionError) as e:
-            if self.verbose:
-                print(f"⚠️ Warning: Could not create directories: {e}")
-            # Continue execution - directories will be created on demand
+        # The output directory is created on the first write, see ensure_output_dir()
+        self._output_dir_ready: bool = False
+    
+    def ensure_output_dir(self) -> Path:
+        """Create the output directory if needed and return it"""
+        if not self._output_dir_ready:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = True
+        return self.output_dir
     
     def _get_required_env(self, key: str) -> str:
         """Get required environment variable or raise error"""
@@ -61,6 +90,21 @@ class Config:
             if self.max_tokens < 1:
                 raise ValueError("Max tokens must be positive")
             
+            if self.max_concurrency < 1:
+                raise ValueError("Max concurrency must be positive")
+            
+            if self.max_retries < 0:
+                raise ValueError("Max retries must not be negative")
+            
+            if self.retry_backoff < 0:
+                raise ValueError("Retry backoff must not be negative")
+            
+            if self.connect_timeout <= 0 or self.read_timeout <= 0:
+                raise ValueError("Timeouts must be positive")
+            
+            if self.cache_ttl < 0:
+                raise ValueError("Cache TTL must not be negative")
+            
             return True
             
         except ValueError as e:
@@ -69,15 +113,10 @@ class Config:
             return False
 
 
-# Global configuration instance - initialized lazily
-_config_instance = None
-
+@lru_cache(maxsize=1)
 def get_config() -> Config:
     """Get the global configuration instance (lazy initialization)"""
-    global _config_instance
-    if _config_instance is None:
-        _config_instance = Config()
-    return _config_instance
+    return Config()
 
 # For backward compatibility - but don't initialize at import time
 def config():
@@ -3,28 +3,100 @@ Graph Generator for Simple Terminal App
 Converts structured data into interactive Plotly charts.
 """
 
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, Any, List, Optional
-import pandas as pd
+from __future__ import annotations
+
+import functools
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from config import get_config
 
+# Plotly is imported inside the chart methods so importing this module stays cheap
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# Palette names mapped to their location in plotly.colors, resolved on first use
+_COLOR_SCHEMES = {
+    'viridis': ('sequential', 'Viridis'),
+    'plotly': ('qualitative', 'Plotly'),
+    'blues': ('sequential', 'Blues'),
+    'reds': ('sequential', 'Reds'),
+    'greens': ('sequential', 'Greens'),
+    'set1': ('qualitative', 'Set1'),
+    'pastel': ('qualitative', 'Pastel'),
+}
+
+# Plotly config for HTML embedding; export_config() hands out plain copies
+_EXPORT_CONFIG = MappingProxyType({
+    'displayModeBar': True,
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ('pan2d', 'lasso2d'),
+    'toImageButtonOptions': MappingProxyType({
+        'format': 'png',
+        'filename': 'chart',
+        'height': 600,
+        'width': 800,
+        'scale': 1
+    }),
+    'responsive': True
+})
+
+
+@functools.lru_cache(maxsize=64)
+def _palette(scheme: str, count: int) -> Tuple[str, ...]:
+    """First `count` colors of a scheme, cycling the base palette as needed"""
+    
+    import plotly.colors
+    
+    group, name = _COLOR_SCHEMES.get(scheme, _COLOR_SCHEMES['plotly'])
+    # Copy into a tuple - plotly's palette lists are shared module state
+    base = tuple(getattr(getattr(plotly.colors, group), name))
+    
+    return tuple(base[i % len(base)] for i in range(count))
+
+
+def _as_array(values: Any) -> Any:
+    """Convert numeric values to a float64 array; leave anything else as given"""
+    
+    try:
+        import numpy as np
+        return np.asarray(values, dtype=np.float64)
+    except (ImportError, TypeError, ValueError):
+        # numpy is optional, and non-numeric values are left for plotly to handle
+        return values
+
+
+def count_data_points(data: Dict[str, Any]) -> int:
+    """Total number of values across all datasets"""
+    return sum(len(dataset.get('values', ())) for dataset in data.get('data', {}).get('datasets', ()))
+
+
+def _index_axis(count: int) -> Any:
+    """0..count-1 as an integer array, for charts plotted against point index"""
+    
+    try:
+        import numpy as np
+        return np.arange(count)
+    except ImportError:
+        return list(range(count))
+
 
 class GraphGenerator:
     """Generates interactive charts using Plotly"""
     
+    __slots__ = ('config', 'color_schemes')
+    
+    # Chart type -> creator method; register new chart types here
+    _DISPATCH = {
+        'bar': '_create_bar_chart',
+        'line': '_create_line_chart',
+        'pie': '_create_pie_chart',
+        'scatter': '_create_scatter_chart',
+    }
+    
     def __init__(self):
         """Initialize the graph generator"""
         self.config = get_config()
-        self.color_schemes = {
-            'viridis': px.colors.sequential.Viridis,
-            'plotly': px.colors.qualitative.Plotly,
-            'blues': px.colors.sequential.Blues,
-            'reds': px.colors.sequential.Reds,
-            'greens': px.colors.sequential.Greens,
-            'set1': px.colors.qualitative.Set1,
-            'pastel': px.colors.qualitative.Pastel,
-        }
+        self.color_schemes = _COLOR_SCHEMES
         
         if self.config.verbose:
             print("✅ Graph generator initialized")
@@ -42,190 +114,183 @@ class GraphGenerator:
         chart_type = (data.get('chart_type') or 'bar').lower()
         
         # Route to appropriate chart creation method
-        if chart_type == 'bar':
-            return self._create_bar_chart(data)
-        elif chart_type == 'line':
-            return self._create_line_chart(data)
-        elif chart_type == 'pie':
-            return self._create_pie_chart(data)
-        elif chart_type == 'scatter':
-            return self._create_scatter_chart(data)
-        else:
+        method_name = self._DISPATCH.get(chart_type)
+        if method_name is None:
             if self.config.verbose:
                 print(f"⚠️ Unknown chart type '{chart_type}', defaulting to bar chart")
-            return self._create_bar_chart(data)
+            method_name = '_create_bar_chart'
+        
+        return getattr(self, method_name)(data)
     
     def _create_bar_chart(self, data: Dict[str, Any]) -> go.Figure:
         """Create a bar chart"""
         
+        import plotly.graph_objects as go
+        
         chart_data = data['data']
         labels = chart_data['labels']
         datasets = chart_data['datasets']
         config_data = data.get('chart_config', {})
         
-        fig = go.Figure()
-        
         # Get colors
         colors = self._get_colors(config_data.get('color_scheme', 'plotly'), len(datasets))
         
-        # Add bars for each dataset
-        for i, dataset in enumerate(datasets):
-            fig.add_trace(go.Bar(
+        # One bar trace per dataset
+        traces = [
+            go.Bar(
                 name=dataset['name'],
                 x=labels,
-                y=dataset['values'],
-                marker_color=colors[i % len(colors)]
-            ))
+                y=_as_array(dataset['values']),
+                marker_color=colors[i % len(colors)],
+                _validate=False
+            )
+            for i, dataset in enumerate(datasets)
+        ]
         
-        # Update layout
-        fig.update_layout(
-            title=data.get('title', 'Bar Chart'),
+        layout = self._build_layout(
+            data, 'Bar Chart',
+            showlegend=config_data.get('show_legend', len(datasets) > 1),
             xaxis_title=config_data.get('x_axis_title', 'Categories'),
             yaxis_title=config_data.get('y_axis_title', 'Values'),
-            showlegend=config_data.get('show_legend', len(datasets) > 1),
-            template='plotly_white',
             hovermode='x unified'
         )
         
-        return fig
+        return go.Figure(data=traces, layout=layout)
     
     def _create_line_chart(self, data: Dict[str, Any]) -> go.Figure:
         """Create a line chart"""
         
+        import plotly.graph_objects as go
+        
         chart_data = data['data']
         labels = chart_data['labels']
         datasets = chart_data['datasets']
         config_data = data.get('chart_config', {})
         
-        fig = go.Figure()
-        
         # Get colors
         colors = self._get_colors(config_data.get('color_scheme', 'plotly'), len(datasets))
         
-        # Add lines for each dataset
-        for i, dataset in enumerate(datasets):
-            fig.add_trace(go.Scatter(
+        # One line trace per dataset
+        traces = [
+            go.Scatter(
                 name=dataset['name'],
                 x=labels,
-                y=dataset['values'],
+                y=_as_array(dataset['values']),
                 mode='lines+markers',
                 line=dict(color=colors[i % len(colors)], width=3),
-                marker=dict(size=8)
-            ))
+                marker=dict(size=8),
+                _validate=False
+            )
+            for i, dataset in enumerate(datasets)
+        ]
         
-        # Update layout
-        fig.update_layout(
-            title=data.get('title', 'Line Chart'),
+        layout = self._build_layout(
+            data, 'Line Chart',
+            showlegend=config_data.get('show_legend', len(datasets) > 1),
             xaxis_title=config_data.get('x_axis_title', 'X-axis'),
             yaxis_title=config_data.get('y_axis_title', 'Y-axis'),
-            showlegend=config_data.get('show_legend', len(datasets) > 1),
-            template='plotly_white',
             hovermode='x unified'
         )
         
-        return fig
+        return go.Figure(data=traces, layout=layout)
     
     def _create_pie_chart(self, data: Dict[str, Any]) -> go.Figure:
         """Create a pie chart"""
         
+        import plotly.graph_objects as go
+        
         chart_data = data['data']
         labels = chart_data['labels']
         
         # For pie charts, use the first dataset
         dataset = chart_data['datasets'][0]
-        values = dataset['values']
+        values = _as_array(dataset['values'])
         config_data = data.get('chart_config', {})
         
         # Get colors
         colors = self._get_colors(config_data.get('color_scheme', 'plotly'), len(labels))
         
-        fig = go.Figure(data=[go.Pie(
+        trace = go.Pie(
             labels=labels,
             values=values,
             hole=0.3,  # Create a donut chart
-            marker_colors=colors
-        )])
+            marker_colors=colors,
+            _validate=False
+        )
         
-        # Update layout
-        fig.update_layout(
-            title=data.get('title', 'Pie Chart'),
-            template='plotly_white',
+        layout = self._build_layout(
+            data, 'Pie Chart',
             showlegend=config_data.get('show_legend', True)
         )
         
-        return fig
+        return go.Figure(data=[trace], layout=layout)
     
     def _create_scatter_chart(self, data: Dict[str, Any]) -> go.Figure:
         """Create a scatter plot"""
         
+        import plotly.graph_objects as go
+        
         chart_data = data['data']
         labels = chart_data['labels']
         datasets = chart_data['datasets']
         config_data = data.get('chart_config', {})
         
-        fig = go.Figure()
-        
         # Get colors
         colors = self._get_colors(config_data.get('color_scheme', 'plotly'), len(datasets))
+        marker = dict(
+            size=12,
+            color=colors[0],
+            opacity=0.7
+        )
         
         # For scatter plots, we need at least 2 datasets (x and y)
         if len(datasets) >= 2:
-            x_data = datasets[0]['values']
-            y_data = datasets[1]['values']
-            
-            fig.add_trace(go.Scatter(
-                x=x_data,
-                y=y_data,
+            trace = go.Scatter(
+                x=_as_array(datasets[0]['values']),
+                y=_as_array(datasets[1]['values']),
                 mode='markers',
-                marker=dict(
-                    size=12,
-                    color=colors[0],
-                    opacity=0.7
-                ),
+                marker=marker,
                 text=labels,
-                hovertemplate='<b>%{text}</b><br>X: %{x}<br>Y: %{y}<extra></extra>'
-            ))
+                hovertemplate='<b>%{text}</b><br>X: %{x}<br>Y: %{y}<extra></extra>',
+                _validate=False
+            )
         else:
             # Fallback: create scatter with indices as x
-            dataset = datasets[0]
-            fig.add_trace(go.Scatter(
-                x=list(range(len(dataset['values']))),
-                y=dataset['values'],
+            values = _as_array(datasets[0]['values'])
+            trace = go.Scatter(
+                x=_index_axis(len(values)),
+                y=values,
                 mode='markers',
-                marker=dict(
-                    size=12,
-                    color=colors[0],
-                    opacity=0.7
-                ),
+                marker=marker,
                 text=labels,
-                hovertemplate='<b>%{text}</b><br>Index: %{x}<br>Value: %{y}<extra></extra>'
-            ))
+                hovertemplate='<b>%{text}</b><br>Index: %{x}<br>Value: %{y}<extra></extra>',
+                _validate=False
+            )
         
-        # Update layout
-        fig.update_layout(
-            title=data.get('title', 'Scatter Plot'),
+        layout = self._build_layout(
+            data, 'Scatter Plot',
+            showlegend=False,
             xaxis_title=config_data.get('x_axis_title', 'X Values'),
-            yaxis_title=config_data.get('y_axis_title', 'Y Values'),
-            template='plotly_white',
-            showlegend=False
+            yaxis_title=config_data.get('y_axis_title', 'Y Values')
         )
         
-        return fig
+        return go.Figure(data=[trace], layout=layout)
     
-    def _get_colors(self, color_scheme: str, count: int) -> List[str]:
-        """Get color palette for charts"""
+    def _build_layout(self, data: Dict[str, Any], default_title: str, **layout_options: Any) -> go.Layout:
+        """Build the shared chart layout in one pass, so the figure needs no update_layout"""
         
-        scheme = color_scheme.lower()
-        if scheme in self.color_schemes:
-            colors = self.color_schemes[scheme]
-        else:
-            colors = self.color_schemes['plotly']
+        import plotly.graph_objects as go
         
-        # Ensure we have enough colors
-        while len(colors) < count:
-            colors.extend(colors)
+        return go.Layout(
+            title=data.get('title', default_title),
+            template='plotly_white',
+            **layout_options
+        )
+    
+    def _get_colors(self, color_scheme: str, count: int) -> Tuple[str, ...]:
+        """Get color palette for charts"""
         
-        return colors[:count]
+        return _palette(color_scheme.lower(), count)
     
     def add_annotations(self, fig: go.Figure, annotations: List[Dict[str, Any]]) -> go.Figure:
         """Add annotations to the chart"""
@@ -282,18 +347,11 @@ class GraphGenerator:
     def export_config(self) -> Dict[str, Any]:
         """Export Plotly configuration for HTML embedding"""
         
+        # Plain copies: callers serialize the config, and neither json nor plotly.io accepts mappingproxy
         return {
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['pan2d', 'lasso2d'],
-            'toImageButtonOptions': {
-                'format': 'png',
-                'filename': 'chart',
-                'height': 600,
-                'width': 800,
-                'scale': 1
-            },
-            'responsive': True
+            **_EXPORT_CONFIG,
+            'modeBarButtonsToRemove': list(_EXPORT_CONFIG['modeBarButtonsToRemove']),
+            'toImageButtonOptions': dict(_EXPORT_CONFIG['toImageButtonOptions'])
         }
 
 
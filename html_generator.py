@@ -3,15 +3,142 @@ HTML Generator for Simple Terminal App
 Creates HTML files with embedded interactive Plotly charts.
 """
 
-import json
+from __future__ import annotations
+
+import functools
+import heapq
 import os
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-import plotly.graph_objects as go
-import plotly.io as pio
+from typing import TYPE_CHECKING, BinaryIO, Dict, Any, List, Optional, Tuple
 from jinja2 import Environment, FileSystemLoader, Template
 from config import get_config
+from graph_generator import count_data_points
+
+# Plotly is imported on first serialization so importing this module stays cheap
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# Anything but letters, digits, '-' and '_' (\w is isalnum() plus '_', Unicode-aware)
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w-]')
+
+
+@functools.lru_cache(maxsize=1)
+def _plotly_io():
+    """Import plotly.io, serializing figures with orjson when it is installed"""
+    
+    import plotly.io as pio
+    
+    # orjson encodes numpy arrays natively in C
+    try:
+        import orjson  # noqa: F401
+        pio.json.config.default_engine = 'orjson'
+    except ImportError:
+        pass
+
+    # Numpy traces are written as base64 'bdata'; pybase64 encodes them with SIMD.
+    # Only plotly's own reference is swapped, the stdlib base64 module is untouched.
+    try:
+        import pybase64
+        import _plotly_utils.utils
+        _plotly_utils.utils.base64 = pybase64
+    except ImportError:
+        pass
+
+    return pio
+
+
+# Output file buffer; large enough that a typical CDN-backed page is flushed in one write
+_WRITE_BUFFER_SIZE = 1 << 16
+
+def _open_unique(path: Path) -> Tuple[Path, BinaryIO]:
+    """Create path for writing, adding _2, _3, ... to the name while that file already exists"""
+    
+    candidate = path
+    suffix = 1
+    while True:
+        try:
+            return candidate, open(candidate, 'xb', buffering=_WRITE_BUFFER_SIZE)
+        except FileExistsError:
+            suffix += 1
+            candidate = path.with_name(f"{path.stem}_{suffix}{path.suffix}")
+
+
+# Constant parts of the embedded Plotly config, built once at import
+_PLOTLY_CONFIG = {
+    'displayModeBar': True,
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ('pan2d', 'lasso2d', 'select2d'),
+    'responsive': True
+}
+_IMAGE_BUTTON_OPTIONS = {
+    'format': 'png',
+    'height': 600,
+    'width': 800,
+    'scale': 2
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _plotlyjs_version() -> str:
+    """plotly.js version bundled with the installed plotly package, loaded from the CDN"""
+    from plotly.offline import get_plotlyjs_version
+    return get_plotlyjs_version()
+
+
+@functools.lru_cache(maxsize=1)
+def _inline_plotlyjs() -> str:
+    """Script tags embedding the bundled plotly.js, read from disk once per process"""
+    from plotly.offline import get_plotlyjs
+    return ("<script>window.PlotlyConfig = {MathJaxConfig: 'local'};</script>\n"
+            f'<script charset="utf-8" type="text/javascript">{get_plotlyjs()}</script>')
+
+
+# Shared copy of plotly.js written next to the charts for include_plotlyjs='directory'
+_PLOTLYJS_FILENAME = 'plotly.min.js'
+
+
+# Page wrapped around the pio.to_html chart div by generate_static_html
+_STATIC_TEMPLATE_SOURCE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ title }}</title>
+    <meta charset="utf-8">
+    {{ plotlyjs|safe }}
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .metadata { margin-top: 20px; padding: 15px; background-color: #f5f5f5; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{{ title }}</h1>
+        <p>{{ description }}</p>
+    </div>
+    
+    {{ chart_html|safe }}
+    
+    <div class="metadata">
+        <h3>Chart Information</h3>
+        <p><strong>Type:</strong> {{ chart_type|title }}</p>
+        <p><strong>Generated:</strong> {{ generation_time }}</p>
+        <p><strong>Model:</strong> {{ model_used }}</p>
+        {% if original_prompt %}
+        <p><strong>Original Prompt:</strong> "{{ original_prompt }}"</p>
+        {% endif %}
+    </div>
+</body>
+</html>
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _static_template() -> Template:
+    """The static page template, compiled on first use"""
+    return Template(_STATIC_TEMPLATE_SOURCE, autoescape=True)
 
 
 class HTMLGenerator:
@@ -23,20 +150,15 @@ class HTMLGenerator:
         self.template_dir = self.config.template_dir
         self.output_dir = self.config.output_dir
         
-        # Ensure directories exist
-        try:
-            self.template_dir.mkdir(exist_ok=True)
-            self.output_dir.mkdir(exist_ok=True)
-        except (OSError, PermissionError) as e:
-            if self.config.verbose:
-                print(f"⚠️ Warning: Could not create directories: {e}")
-        
         # Initialize Jinja2 environment
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(self.template_dir)),
             autoescape=True
         )
         
+        # Compiled chart template, loaded on first render
+        self._template: Optional[Template] = None
+        
         if self.config.verbose:
             print("✅ HTML generator initialized")
     
@@ -56,13 +178,16 @@ class HTMLGenerator:
             Path to generated HTML file
         """
         
+        # One timestamp for both the filename and the page metadata
+        now = datetime.now()
+        
         # Generate filename if not provided
-        if not output_filename:
+        generated_name = not output_filename
+        if generated_name:
             title = data.get('title', 'chart').lower()
             # Clean title for filename
-            clean_title = ''.join(c if c.isalnum() or c in '-_' else '_' for c in title)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"{clean_title}_{timestamp}.html"
+            clean_title = _UNSAFE_FILENAME_CHARS.sub('_', title)
+            output_filename = f"{clean_title}_{now:%Y%m%d_%H%M%S}.html"
         
         # Ensure .html extension
         if not output_filename.endswith('.html'):
@@ -72,15 +197,30 @@ class HTMLGenerator:
         
         try:
             # Prepare template data
-            template_data = self._prepare_template_data(figure, data)
+            template_data = self._prepare_template_data(figure, data, now)
             
-            # Load and render template
+            # Load template and stream the rendered chunks straight to the file,
+            # so the multi-megabyte page is never joined into one string
             template = self._load_template()
-            html_content = template.render(**template_data)
             
-            # Write HTML file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            stream = template.stream(**template_data)
+            stream.enable_buffering(size=32)  # Hand the file fewer, larger chunks
+            
+            self.config.ensure_output_dir()
+            if generated_name:
+                # Charts with the same title generated within one second (e.g. a batch)
+                # get distinct files instead of overwriting each other
+                output_path, f = _open_unique(output_path)
+            else:
+                f = open(output_path, 'wb', buffering=_WRITE_BUFFER_SIZE)
+            
+            try:
+                with f:
+                    stream.dump(f, encoding='utf-8')
+            except BaseException:
+                # Don't leave a truncated page behind for Recent Charts to list
+                output_path.unlink(missing_ok=True)
+                raise
             
             if self.config.verbose:
                 print(f"✅ HTML file generated: {output_path}")
@@ -92,43 +232,46 @@ class HTMLGenerator:
                 print(f"❌ Error generating HTML: {str(e)}")
             raise Exception(f"Failed to generate HTML file: {str(e)}")
     
-    def _prepare_template_data(self, figure: go.Figure, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_template_data(self,
+                               figure: go.Figure,
+                               data: Dict[str, Any],
+                               now: Optional[datetime] = None) -> Dict[str, Any]:
         """Prepare data for template rendering"""
         
-        # Convert Plotly figure to JSON
-        chart_json = figure.to_json()
+        if now is None:
+            now = datetime.now()
         
-        # Plotly configuration
+        # Plotly configuration; only the export filename varies per chart
         plotly_config = {
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['pan2d', 'lasso2d', 'select2d'],
+            **_PLOTLY_CONFIG,
             'toImageButtonOptions': {
-                'format': 'png',
-                'filename': data.get('title', 'chart').lower().replace(' ', '_'),
-                'height': 600,
-                'width': 800,
-                'scale': 2
-            },
-            'responsive': True
+                **_IMAGE_BUTTON_OPTIONS,
+                'filename': data.get('title', 'chart').lower().replace(' ', '_')
+            }
         }
         
-        # Calculate data points
-        data_points = 0
-        chart_data = data.get('data', {})
-        if 'datasets' in chart_data:
-            for dataset in chart_data['datasets']:
-                data_points += len(dataset.get('values', []))
+        # Serialize the figure and its config together in one pass; to_dict skips
+        # revalidation, and to_json_plotly handles numpy arrays with the orjson engine
+        # _plotly_io() runs first: it installs pybase64 before to_dict() base64-encodes the arrays
+        pio = _plotly_io()
+        figure_dict = figure.to_dict()
+        chart_payload = pio.json.to_json_plotly({
+            'data': figure_dict['data'],
+            'layout': figure_dict['layout'],
+            'config': plotly_config
+        })
+        
+        data_points = count_data_points(data)
         
         # Prepare template variables
         template_data = {
             'title': data.get('title', 'Generated Chart'),
             'description': data.get('description', ''),
             'chart_type': data.get('chart_type', 'unknown'),
-            'chart_json': chart_json,
-            'plotly_config': json.dumps(plotly_config),
+            'chart_payload': chart_payload,
+            'plotly_js_version': _plotlyjs_version(),
             'data_points': data_points,
-            'generation_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'generation_time': f"{now:%Y-%m-%d %H:%M:%S}",
             'model_used': data.get('model_used', 'Gemini'),
             'original_prompt': data.get('original_prompt', '')
         }
@@ -136,16 +279,21 @@ class HTMLGenerator:
         return template_data
     
     def _load_template(self) -> Template:
-        """Load HTML template"""
+        """Load HTML template (compiled once per generator)"""
+        
+        if self._template is not None:
+            return self._template
         
         template_path = self.template_dir / 'chart_template.html'
         
         if template_path.exists():
             # Load custom template
-            return self.jinja_env.get_template('chart_template.html')
+            self._template = self.jinja_env.get_template('chart_template.html')
         else:
             # Use default template
-            return Template(self._get_default_template())
+            self._template = Template(self._get_default_template())
+        
+        return self._template
     
     def _get_default_template(self) -> str:
         """Get default HTML template if custom template not found"""
@@ -157,7 +305,7 @@ class HTMLGenerator:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{{ title }}</title>
-    <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-{{ plotly_js_version }}.min.js"></script>
     <style>
         body { 
             font-family: Arial, sans-serif; 
@@ -218,10 +366,9 @@ class HTMLGenerator:
     </div>
 
     <script>
-        const chartData = {{ chart_json|safe }};
-        const config = {{ plotly_config|safe }};
+        const chart = {{ chart_payload|safe }};
         
-        Plotly.newPlot('chart', chartData.data, chartData.layout, config);
+        Plotly.newPlot('chart', chart.data, chart.layout, chart.config);
         
         window.addEventListener('resize', function() {
             Plotly.Plots.resize('chart');
@@ -244,25 +391,32 @@ class HTMLGenerator:
     def generate_static_html(self, 
                            figure: go.Figure, 
                            data: Dict[str, Any], 
-                           output_filename: Optional[str] = None) -> str:
+                           output_filename: Optional[str] = None,
+                           include_plotlyjs: str = 'inline') -> str:
         """
-        Generate static HTML (no external dependencies)
+        Generate static HTML (self-contained by default)
         
         Args:
             figure: Plotly figure object
             data: Original data dictionary
             output_filename: Optional custom filename
+            include_plotlyjs: 'inline' embeds plotly.js (~4.5 MB) in the file, 'cdn' loads it
+                from cdn.plot.ly, 'directory' shares one plotly.min.js in the output directory
             
         Returns:
             Path to generated HTML file
         """
         
+        if include_plotlyjs not in ('inline', 'cdn', 'directory'):
+            raise ValueError(f"Unsupported include_plotlyjs mode: {include_plotlyjs}")
+        
+        now = datetime.now()
+        
         # Generate filename if not provided
         if not output_filename:
             title = data.get('title', 'chart').lower()
-            clean_title = ''.join(c if c.isalnum() or c in '-_' else '_' for c in title)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"{clean_title}_static_{timestamp}.html"
+            clean_title = _UNSAFE_FILENAME_CHARS.sub('_', title)
+            output_filename = f"{clean_title}_static_{now:%Y%m%d_%H%M%S}.html"
         
         if not output_filename.endswith('.html'):
             output_filename += '.html'
@@ -271,51 +425,33 @@ class HTMLGenerator:
         
         try:
             # Generate static HTML with embedded Plotly
-            html_content = pio.to_html(
+            html_content = _plotly_io().to_html(
                 figure,
                 config={
                     'displayModeBar': True,
                     'displaylogo': False,
                     'responsive': True
                 },
-                include_plotlyjs=True,  # Embed Plotly.js
-                div_id="chart"
+                include_plotlyjs=False,  # Embedded once in <head> below
+                full_html=False,
+                div_id="chart",
+                validate=False
             )
             
             # Wrap in a complete HTML document
-            full_html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{data.get('title', 'Generated Chart')}</title>
-    <meta charset="utf-8">
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        .header {{ text-align: center; margin-bottom: 20px; }}
-        .metadata {{ margin-top: 20px; padding: 15px; background-color: #f5f5f5; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{data.get('title', 'Generated Chart')}</h1>
-        <p>{data.get('description', '')}</p>
-    </div>
-    
-    {html_content}
-    
-    <div class="metadata">
-        <h3>Chart Information</h3>
-        <p><strong>Type:</strong> {data.get('chart_type', 'unknown').title()}</p>
-        <p><strong>Generated:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        <p><strong>Model:</strong> {data.get('model_used', 'Gemini')}</p>
-        {f'<p><strong>Original Prompt:</strong> "{data.get("original_prompt", "")}"</p>' if data.get('original_prompt') else ''}
-    </div>
-</body>
-</html>
-            """
+            full_html = _static_template().render(
+                title=data.get('title', 'Generated Chart'),
+                description=data.get('description', ''),
+                chart_type=data.get('chart_type', 'unknown'),
+                generation_time=f"{now:%Y-%m-%d %H:%M:%S}",
+                model_used=data.get('model_used', 'Gemini'),
+                original_prompt=data.get('original_prompt', ''),
+                plotlyjs=self._plotlyjs_tags(include_plotlyjs),
+                chart_html=html_content
+            )
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(full_html)
+            self.config.ensure_output_dir()
+            output_path.write_bytes(full_html.encode('utf-8'))
             
             if self.config.verbose:
                 print(f"✅ Static HTML file generated: {output_path}")
@@ -327,19 +463,43 @@ class HTMLGenerator:
                 print(f"❌ Error generating static HTML: {str(e)}")
             raise Exception(f"Failed to generate static HTML file: {str(e)}")
     
+    def _plotlyjs_tags(self, include_plotlyjs: str) -> str:
+        """Script tags that load plotly.js for a static page"""
+        
+        if include_plotlyjs == 'inline':
+            return _inline_plotlyjs()
+        
+        if include_plotlyjs == 'cdn':
+            src = f"https://cdn.plot.ly/plotly-{_plotlyjs_version()}.min.js"
+        else:
+            # Written once; later pages only reference it
+            plotlyjs_path = self.output_dir / _PLOTLYJS_FILENAME
+            if not plotlyjs_path.exists():
+                from plotly.offline import get_plotlyjs
+                self.config.ensure_output_dir()
+                plotlyjs_path.write_text(get_plotlyjs(), encoding='utf-8')
+            src = _PLOTLYJS_FILENAME
+        
+        return f'<script src="{src}" charset="utf-8"></script>'
+    
     def list_output_files(self) -> list:
         """List all generated HTML files"""
         
-        html_files = list(self.output_dir.glob('*.html'))
-        return [str(f) for f in html_files]
+        return [entry.path for entry in self._scan_output_files()]
+    
+    def recent_output_files(self, limit: int = 5) -> List[Path]:
+        """Most recently modified HTML files, newest first"""
+        
+        newest = heapq.nlargest(limit, self._scan_output_files(), key=lambda entry: entry.stat().st_mtime)
+        return [Path(entry.path) for entry in newest]
     
     def clean_output_directory(self) -> int:
         """Clean old HTML files from output directory"""
         
-        html_files = list(self.output_dir.glob('*.html'))
         count = 0
         
-        for file_path in html_files:
+        for entry in self._scan_output_files():
+            file_path = Path(entry.path)
             try:
                 file_path.unlink()
                 count += 1
@@ -351,6 +511,15 @@ class HTMLGenerator:
             print(f"🗑️ Cleaned {count} HTML files from output directory")
         
         return count
+    
+    def _scan_output_files(self) -> List[os.DirEntry]:
+        """HTML files in the output directory, from a single directory read"""
+        
+        try:
+            with os.scandir(self.output_dir) as entries:
+                return [entry for entry in entries if entry.name.endswith('.html') and entry.is_file()]
+        except FileNotFoundError:
+            return []
 
 
 def test_html_generator():
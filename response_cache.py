@@ -0,0 +1,171 @@
+"""
+Response Cache for API Chart Generator
+Stores API responses on disk keyed by a hash of the request, so repeated
+prompts skip the network round trip entirely. Recently used entries are also
+kept in memory so hot keys don't reopen the shelve file.
+"""
+
+import hashlib
+import pickle
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+
+class ResponseCache:
+    """Disk-backed cache with per-entry expiry, split into namespaces"""
+
+    def __init__(self, cache_dir: Path, ttl: int = 7 * 86400, memory_size: int = 128):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the shelve files
+            ttl: Seconds before an entry expires
+            memory_size: Number of entries kept in the in-memory LRU
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self._lock = threading.Lock()
+        # (namespace, key) -> (stored_at, pickled value); pickled so callers
+        # get a fresh copy they can mutate, same as a shelve read
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(*parts: bytes) -> str:
+        """Build a cache key from the raw request bytes"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry"""
+
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+            if entry is not None:
+                stored_at, blob = entry
+                if time.time() - stored_at <= self.ttl:
+                    self._memory.move_to_end((namespace, key))
+                    return pickle.loads(blob)
+                del self._memory[(namespace, key)]
+
+        try:
+            with self._lock, shelve.open(self._path(namespace)) as db:
+                entry = db.get(key)
+                if entry is None:
+                    return None
+
+                stored_at, value = entry
+                if time.time() - stored_at > self.ttl:
+                    del db[key]
+                    return None
+
+                self._remember(namespace, key, stored_at, value)
+                return value
+        except Exception:
+            # A missing or unreadable cache file is just a miss
+            return None
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store a value under the given namespace"""
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            stored_at = time.time()
+            with self._lock, shelve.open(self._path(namespace)) as db:
+                db[key] = (stored_at, value)
+                self._remember(namespace, key, stored_at, value)
+        except Exception:
+            # Caching is best-effort; never fail the request because of it
+            pass
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+
+        with self._lock:
+            self._memory.clear()
+
+        if not self.cache_dir.exists():
+            return
+
+        with self._lock:
+            for file_path in self.cache_dir.glob('*.cache*'):
+                try:
+                    file_path.unlink()
+                except OSError:
+                    pass
+
+    def _remember(self, namespace: str, key: str, stored_at: float, value: Any) -> None:
+        """Put an entry in the in-memory LRU; caller holds the lock"""
+        self._memory[(namespace, key)] = (stored_at, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self._memory.move_to_end((namespace, key))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _path(self, namespace: str) -> str:
+        return str(self.cache_dir / f"{namespace}.cache")
+
+
+def test_response_cache():
+    """Test the response cache"""
+    
+    import tempfile
+    
+    print("🧪 Testing Response Cache...")
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResponseCache(Path(temp_dir), memory_size=2)
+            key = ResponseCache.make_key(b'{"prompt": "sales"}', b'bar')
+            assert key == ResponseCache.make_key(b'{"prompt": "sales"}', b'bar')
+            assert key != ResponseCache.make_key(b'{"prompt": "sales"}', b'pie')
+            
+            # Round trip, with namespaces kept apart
+            assert cache.get('charts', key) is None
+            cache.set('charts', key, {'labels': ['a', 'b'], 'values': [1, 2]})
+            assert cache.get('charts', key) == {'labels': ['a', 'b'], 'values': [1, 2]}
+            assert cache.get('responses', key) is None
+            
+            # Mutating a returned value must not leak into the memory LRU
+            cached = cache.get('charts', key)
+            cached['labels'].append('c')
+            assert cache.get('charts', key)['labels'] == ['a', 'b']
+            
+            # Entries evicted from memory are still served from disk
+            for index in range(3):
+                cache.set('charts', f'other-{index}', index)
+            assert ('charts', key) not in cache._memory
+            assert cache.get('charts', key) == {'labels': ['a', 'b'], 'values': [1, 2]}
+            assert len(cache._memory) == 2
+            
+            # A fresh instance reads what the first one wrote
+            assert ResponseCache(Path(temp_dir)).get('charts', key) is not None
+            
+            # Expired entries are misses, in memory and on disk
+            cache.ttl = -1
+            assert cache.get('charts', key) is None
+            cache.ttl = 7 * 86400
+            assert cache.get('charts', key) is None
+            
+            # Clearing drops everything
+            cache.set('charts', key, 1)
+            cache.clear()
+            assert cache.get('charts', key) is None
+            assert ResponseCache(Path(temp_dir)).get('charts', key) is None
+        
+        print("✅ Response cache test successful!")
+        return True
+        
+    except AssertionError as e:
+        print(f"❌ Response cache test failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    test_response_cache()
@@ -4,12 +4,17 @@ Provides a beautiful chat-based interface for generating interactive charts.
 """
 
 import streamlit as st
+import asyncio
+import importlib.util
 import os
-import time
+import platform
+import re
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-import webbrowser
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Import our existing components
 try:
@@ -24,6 +29,334 @@ except ImportError as e:
     st.stop()
 
 
+# API calls go through the client's pooled httpx.AsyncClient when httpx is installed
+_HAS_HTTPX = importlib.util.find_spec('httpx') is not None
+
+# File manager command for "Show in Folder" (os.startfile is used on Windows)
+_OPEN_FOLDER_CMD = 'open' if platform.system() == 'Darwin' else 'xdg-open'
+
+# st.fragment (1.37+, experimental_fragment from 1.33) reruns only the decorated part
+# of the page on widget changes; older Streamlit reruns the whole script as before
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+# Chat history kept in session state; older messages drop off the front
+_MAX_MESSAGES = 50
+
+# Older charts listed from disk once they have dropped out of the history
+_OLDER_CHARTS_LIMIT = 20
+
+_WELCOME_MESSAGE = "👋 Hi! I'm your AI chart generator. Tell me what kind of chart you'd like to create!\n\n**Examples:**\n- *Create a pie chart showing market share*\n- *Generate monthly sales trends as a line chart*\n- *Show quarterly revenue comparison*\n\n💡 **Note:** If the chat input becomes unresponsive after your first message, please refresh the page. This is a known issue we're working to resolve."
+_RESET_MESSAGE = "👋 Chat has been reset! Tell me what kind of chart you'd like to create!"
+
+# Chat replies to a chart request; the success text has a variant for responses with analysis
+_SUCCESS_TEMPLATE = """
+🎉 **Chart Generated Successfully!**
+
+📊 **Chart Type:** {chart_type}
+📈 **Data Points:** {data_points}
+💾 **Title:** {title}
+
+Your interactive chart has been created and saved!
+"""
+_SUCCESS_WITH_ANALYSIS_TEMPLATE = """
+🎉 **Chart Generated Successfully!**
+
+📊 **Chart Type:** {chart_type}
+📈 **Data Points:** {data_points}
+💾 **Title:** {title}
+🧠 **AI Analysis:** Available below
+
+Your interactive chart has been created and saved!
+"""
+_FAILURE_MESSAGE = """
+❌ **Chart Generation Failed**
+
+Please try:
+- Being more specific about your data requirements
+- Checking your internet connection
+- Trying a different chart type
+
+Example: *"Create a pie chart showing smartphone market share with 5-6 brands"*
+"""
+_UNEXPECTED_ERROR_TEMPLATE = """
+❌ **Unexpected Error Occurred**
+
+Error details: {error}
+
+Please try again with a different request. The chat input should remain functional.
+
+💡 **Tip:** Try a simpler request like "Create a bar chart with sample data"
+"""
+
+# Sidebar chart type choices and the chart_type each one requests
+_CHART_TYPE_OPTIONS = {
+    "Auto-detect": None,
+    "📊 Bar Chart": "bar",
+    "📈 Line Chart": "line",
+    "🥧 Pie Chart": "pie",
+    "📍 Scatter Plot": "scatter"
+}
+_CHART_TYPE_LABELS = tuple(_CHART_TYPE_OPTIONS)
+
+# '*' or '-' list markers at the start of a line ('**bold**' and '---' rules are left alone)
+_BULLET_RE = re.compile(r'^[ \t]*[*-](?![*-])[ \t]*', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
+# Page styling and header, shared by every rerun
+_PAGE_STYLE = """
+<style>
+.main-header {
+    text-align: center;
+    padding: 1rem 0;
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-radius: 10px;
+    margin-bottom: 2rem;
+}
+
+.chat-message {
+    padding: 1rem;
+    border-radius: 10px;
+    margin-bottom: 1rem;
+    border-left: 4px solid #667eea;
+    background-color: #f8f9fa;
+}
+
+.stButton > button {
+    width: 100%;
+    border-radius: 5px;
+    border: none;
+    padding: 0.5rem 1rem;
+    font-weight: 500;
+}
+</style>
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🤖 API Chart Generator</h1>
+    <p>Transform your ideas into beautiful interactive charts with AI</p>
+</div>
+"""
+
+# Response fields display_chart_info reads (chart values are left out)
+_CHART_INFO_FIELDS = ('title', 'description', 'chart_type', 'chart_config', 'original_prompt',
+                      'prediction_analysis', 'parsing_error', 'error_reason')
+
+
+def _new_history(content: str) -> deque:
+    """Bounded chat history starting with one assistant message"""
+    return deque([{"role": "assistant", "content": content}], maxlen=_MAX_MESSAGES)
+
+
+def _chart_summary(api_response: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an API response without the dataset values, for storing in the chat history"""
+    summary = {key: api_response[key] for key in _CHART_INFO_FIELDS if key in api_response}
+    data = api_response.get('data', {})
+    summary['data'] = {
+        'labels': data.get('labels', []),
+        'datasets': [{'name': dataset.get('name')} for dataset in data.get('datasets', [])]
+    }
+    return summary
+
+
+@st.cache_resource(show_spinner="🚀 Initializing API Chart Generator...")
+def _get_clients():
+    """Config and components shared across reruns and sessions (failures are not cached)"""
+    config = get_config()
+    
+    if not config.validate():
+        raise ValueError("Configuration validation failed. Please check your .env file.")
+    
+    return config, APIClient(), GraphGenerator(), HTMLGenerator()
+
+
+@st.cache_resource
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop on a daemon thread; the async HTTP client is bound to one loop,
+    so reusing it keeps pooled connections (and TLS sessions) alive across requests"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="api-event-loop", daemon=True).start()
+    return loop
+
+
+async def _agenerate_all(api_client: APIClient, prompts: List[str], chart_type: Optional[str]) -> list:
+    """API responses for several prompts fetched concurrently; failures are returned, not raised"""
+    return await asyncio.gather(
+        *(api_client.agenerate_data_and_chart(prompt, chart_type) for prompt in prompts),
+        return_exceptions=True
+    )
+
+
+@st.cache_resource
+def _html_executor() -> ThreadPoolExecutor:
+    """Worker threads that write chart HTML files while the UI keeps rendering"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="html-writer")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _read_html_bytes(path: str, mtime: float) -> bytes:
+    """Contents of a chart file, re-read only when its modification time changes"""
+    return Path(path).read_bytes()
+
+
+@st.cache_data(ttl=5, max_entries=8, show_spinner=False)
+def _recent_charts(_html_generator: HTMLGenerator, output_dir: str, dir_mtime: float) -> List[Tuple[str, str]]:
+    """(name, absolute path) of the newest charts; the directory mtime in the key drops
+    the cached listing as soon as a chart is written or deleted"""
+    return [(path.name, str(path.absolute())) for path in _html_generator.recent_output_files(5)]
+
+
+def _open_in_browser(url: str) -> None:
+    """Open url in the web browser from a daemon thread, so launching it never blocks the script"""
+    import webbrowser
+    threading.Thread(target=webbrowser.open, args=(url,), name="open-browser", daemon=True).start()
+
+
+def _dir_mtime(path: Path) -> float:
+    """Modification time of a directory, 0.0 until it has been created"""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _format_analysis_text(analysis_text: str) -> str:
+    """Format the analysis text for better display in Streamlit (memoized per text)"""
+    
+    # Handle None or empty input
+    if not analysis_text:
+        return ""
+    
+    # Ensure we have a string
+    if not isinstance(analysis_text, str):
+        return str(analysis_text)
+    
+    # Turn '*'/'-' list items into bullets and collapse runs of blank lines
+    formatted = _BULLET_RE.sub('• ', analysis_text.strip())
+    return _BLANK_LINES_RE.sub('\n\n', formatted)
+
+
+@_fragment
+def _display_chart_info(html_path: str, api_response: dict):
+    """Display chart information, analysis, and actions; as a fragment, its buttons rerun only this chart"""
+    # Path, stat and widget key are worked out once per render
+    chart_file = Path(html_path)
+    file_stat = chart_file.stat()
+    key_suffix = chart_file.stem  # Chart files have unique names in the output directory
+    
+    chart_type = api_response.get('chart_type', 'Unknown')
+    data_points = len(api_response.get('data', {}).get('labels', []))
+    
+    # Display prediction analysis if available
+    prediction_analysis = api_response.get('prediction_analysis')
+    parsing_error = api_response.get('parsing_error', False)
+    
+    if prediction_analysis:
+        # Show different header based on whether there was a parsing error
+        if parsing_error:
+            st.subheader("🧠 AI Analysis (Chart parsing had issues)")
+            error_reason = api_response.get('error_reason', 'Unknown error')
+            st.warning(f"⚠️ {error_reason}, but AI analysis was successfully extracted.")
+        else:
+            st.subheader("🧠 AI Analysis")
+        
+        with st.expander("📝 View Detailed Analysis", expanded=True):
+            # Style the analysis text with better formatting
+            formatted_analysis = _format_analysis_text(prediction_analysis)
+            st.markdown(formatted_analysis)
+        
+        st.divider()
+    
+    # Chart metrics section
+    st.subheader("📊 Chart Details")
+    
+    # Create columns for info display
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("📊 Chart Type", chart_type.title())
+    
+    with col2:
+        st.metric("📈 Data Points", data_points)
+    
+    with col3:
+        st.metric("💾 File Size", f"{file_stat.st_size:,} bytes")
+    
+    # Additional chart information
+    with st.expander("📋 Chart Configuration Details"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Chart Information:**")
+            st.write(f"• **Title:** {api_response.get('title', 'N/A')}")
+            st.write(f"• **Description:** {api_response.get('description', 'N/A')}")
+            st.write(f"• **Type:** {chart_type.title()}")
+            
+            # Data information
+            data = api_response.get('data', {})
+            labels = data.get('labels', [])
+            datasets = data.get('datasets', [])
+            
+            st.write(f"• **Labels:** {', '.join(labels[:3])}{'...' if len(labels) > 3 else ''}")
+            st.write(f"• **Datasets:** {len(datasets)} series")
+        
+        with col2:
+            st.write("**Chart Configuration:**")
+            chart_config = api_response.get('chart_config', {})
+            st.write(f"• **X-Axis:** {chart_config.get('x_axis_title', 'N/A')}")
+            st.write(f"• **Y-Axis:** {chart_config.get('y_axis_title', 'N/A')}")
+            st.write(f"• **Color Scheme:** {chart_config.get('color_scheme', 'N/A')}")
+            st.write(f"• **Show Legend:** {'Yes' if chart_config.get('show_legend', True) else 'No'}")
+            
+            # Show original prompt if available
+            original_prompt = api_response.get('original_prompt', '')
+            if original_prompt:
+                st.write("**Original Request:**")
+                st.write(f"*\"{original_prompt[:100]}{'...' if len(original_prompt) > 100 else ''}\"*")
+    
+    st.divider()
+    
+    # Action buttons, keyed per chart file
+    st.subheader("🎯 Actions")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if st.button("🌐 Open in Browser", key=f"open_{key_suffix}"):
+            _open_in_browser(f"file://{os.path.abspath(html_path)}")
+            st.success("📂 File opened in browser!")
+    
+    with col2:
+        if st.button("📁 Show in Folder", key=f"folder_{key_suffix}"):
+            folder_path = chart_file.parent
+            try:
+                if os.name == 'nt':  # Windows
+                    os.startfile(folder_path)
+                else:  # macOS/Linux, without going through a shell
+                    subprocess.Popen([_OPEN_FOLDER_CMD, str(folder_path)])
+                st.success("📂 Folder opened!")
+            except OSError as e:
+                st.warning(f"⚠️ Could not open the folder: {str(e)}")
+    
+    with col3:
+        # Download button for HTML file
+        st.download_button(
+            label="⬇️ Download HTML",
+            data=_read_html_bytes(html_path, file_stat.st_mtime),
+            file_name=chart_file.name,
+            mime="text/html",
+            key=f"download_{key_suffix}"
+        )
+    
+    with col4:
+        if st.button("🔄 Generate Another", key=f"another_{key_suffix}"):
+            st.rerun()
+    
+    # Display file path
+    st.info(f"📍 **File Location:** `{html_path}`")
+
+
 class StreamlitChatApp:
     """Streamlit chat interface for the API chart generator"""
     
@@ -39,17 +372,7 @@ class StreamlitChatApp:
         try:
             if not self.initialized:
                 with st.spinner("🚀 Initializing API Chart Generator..."):
-                    self.config = get_config()
-                    
-                    if not self.config.validate():
-                        st.error("❌ Configuration validation failed. Please check your .env file.")
-                        return False
-                    
-                    self.api_client = APIClient()
-                    self.graph_generator = GraphGenerator()
-                    self.html_generator = HTMLGenerator()
-                    
-                    self.initialized = True
+                    self._do_init()
                     st.success("✅ API Chart Generator ready!")
             
             return True
@@ -59,12 +382,24 @@ class StreamlitChatApp:
             st.info("💡 Make sure your .env file exists with a valid API_URL")
             return False
     
-    def process_chart_request(self, user_prompt: str, chart_type: Optional[str] = None) -> Optional[str]:
+    def _do_init(self) -> None:
+        """Attach the shared components, raising if the configuration is invalid"""
+        self.config, self.api_client, self.graph_generator, self.html_generator = _get_clients()
+        self.initialized = True
+    
+    def process_chart_request(self,
+                              user_prompt: str,
+                              chart_type: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
         """Process user request and generate chart"""
         try:
             with st.spinner("🧠 Processing with API..."):
                 # Generate data with API
-                api_response = self.api_client.generate_data_and_chart(user_prompt, chart_type)
+                if _HAS_HTTPX:
+                    api_response = asyncio.run_coroutine_threadsafe(
+                        self.api_client.agenerate_data_and_chart(user_prompt, chart_type), _event_loop()
+                    ).result()
+                else:
+                    api_response = self.api_client.generate_data_and_chart(user_prompt, chart_type)
             
             with st.spinner("📊 Creating interactive chart..."):
                 # Create chart
@@ -80,153 +415,56 @@ class StreamlitChatApp:
             st.error(f"❌ Error generating chart: {str(e)}")
             return None, None
     
-    def display_chart_info(self, html_path: str, api_response: dict):
-        """Display chart information, analysis, and actions"""
-        chart_type = api_response.get('chart_type', 'Unknown')
-        data_points = len(api_response.get('data', {}).get('labels', []))
-        
-        # Display prediction analysis if available
-        prediction_analysis = api_response.get('prediction_analysis')
-        parsing_error = api_response.get('parsing_error', False)
-        
-        if prediction_analysis:
-            # Show different header based on whether there was a parsing error
-            if parsing_error:
-                st.subheader("🧠 AI Analysis (Chart parsing had issues)")
-                error_reason = api_response.get('error_reason', 'Unknown error')
-                st.warning(f"⚠️ {error_reason}, but AI analysis was successfully extracted.")
+    def process_chart_requests(self,
+                               user_prompts: List[str],
+                               chart_type: Optional[str] = None) -> List[Tuple[Optional[Future], Optional[Dict[str, Any]]]]:
+        """Process several prompts together; their API calls share the connection pool and run concurrently,
+        and each HTML file is written on the worker pool while earlier charts are being displayed"""
+        with st.spinner(f"🧠 Processing {len(user_prompts)} requests with API..."):
+            if _HAS_HTTPX:
+                responses = asyncio.run_coroutine_threadsafe(
+                    _agenerate_all(self.api_client, user_prompts, chart_type), _event_loop()
+                ).result()
             else:
-                st.subheader("🧠 AI Analysis")
-            
-            with st.expander("📝 View Detailed Analysis", expanded=True):
-                # Style the analysis text with better formatting
-                formatted_analysis = self._format_analysis_text(prediction_analysis)
-                st.markdown(formatted_analysis)
-            
-            st.divider()
-        
-        # Chart metrics section
-        st.subheader("📊 Chart Details")
-        
-        # Create columns for info display
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("📊 Chart Type", chart_type.title())
+                responses = []
+                for user_prompt in user_prompts:
+                    try:
+                        responses.append(self.api_client.generate_data_and_chart(user_prompt, chart_type))
+                    except Exception as e:
+                        responses.append(e)
         
-        with col2:
-            st.metric("📈 Data Points", data_points)
-        
-        with col3:
-            file_size = Path(html_path).stat().st_size
-            st.metric("💾 File Size", f"{file_size:,} bytes")
-        
-        # Additional chart information
-        with st.expander("📋 Chart Configuration Details"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write("**Chart Information:**")
-                st.write(f"• **Title:** {api_response.get('title', 'N/A')}")
-                st.write(f"• **Description:** {api_response.get('description', 'N/A')}")
-                st.write(f"• **Type:** {chart_type.title()}")
+        results = []
+        for user_prompt, api_response in zip(user_prompts, responses):
+            try:
+                if isinstance(api_response, Exception):
+                    raise api_response
                 
-                # Data information
-                data = api_response.get('data', {})
-                labels = data.get('labels', [])
-                datasets = data.get('datasets', [])
+                with st.spinner("📊 Creating interactive chart..."):
+                    figure = self.graph_generator.create_chart(api_response)
                 
-                st.write(f"• **Labels:** {', '.join(labels[:3])}{'...' if len(labels) > 3 else ''}")
-                st.write(f"• **Datasets:** {len(datasets)} series")
-            
-            with col2:
-                st.write("**Chart Configuration:**")
-                chart_config = api_response.get('chart_config', {})
-                st.write(f"• **X-Axis:** {chart_config.get('x_axis_title', 'N/A')}")
-                st.write(f"• **Y-Axis:** {chart_config.get('y_axis_title', 'N/A')}")
-                st.write(f"• **Color Scheme:** {chart_config.get('color_scheme', 'N/A')}")
-                st.write(f"• **Show Legend:** {'Yes' if chart_config.get('show_legend', True) else 'No'}")
+                html_future = _html_executor().submit(self.html_generator.generate_html, figure, api_response)
+                results.append((html_future, api_response))
                 
-                # Show original prompt if available
-                original_prompt = api_response.get('original_prompt', '')
-                if original_prompt:
-                    st.write("**Original Request:**")
-                    st.write(f"*\"{original_prompt[:100]}{'...' if len(original_prompt) > 100 else ''}\"*")
-        
-        st.divider()
-        
-        # Action buttons
-        st.subheader("🎯 Actions")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            if st.button("🌐 Open in Browser", key=f"open_{hash(html_path)}"):
-                webbrowser.open(f"file://{os.path.abspath(html_path)}")
-                st.success("📂 File opened in browser!")
-        
-        with col2:
-            if st.button("📁 Show in Folder", key=f"folder_{hash(html_path)}"):
-                folder_path = Path(html_path).parent
-                if os.name == 'nt':  # Windows
-                    os.startfile(folder_path)
-                elif os.name == 'posix':  # macOS/Linux
-                    os.system(f'open "{folder_path}"' if os.uname().sysname == 'Darwin' else f'xdg-open "{folder_path}"')
-                st.success("📂 Folder opened!")
-        
-        with col3:
-            # Download button for HTML file
-            with open(html_path, 'rb') as f:
-                st.download_button(
-                    label="⬇️ Download HTML",
-                    data=f.read(),
-                    file_name=Path(html_path).name,
-                    mime="text/html",
-                    key=f"download_{hash(html_path)}"
-                )
-        
-        with col4:
-            if st.button("🔄 Generate Another", key=f"another_{hash(html_path)}"):
-                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Error generating chart for \"{user_prompt}\": {str(e)}")
+                results.append((None, None))
         
-        # Display file path
-        st.info(f"📍 **File Location:** `{html_path}`")
+        return results
+    
+    def display_chart_info(self, html_path: str, api_response: dict):
+        """Display chart information, analysis, and actions"""
+        _display_chart_info(html_path, api_response)
     
     def _format_analysis_text(self, analysis_text: str) -> str:
         """Format the analysis text for better display in Streamlit"""
-        
-        # Handle None or empty input
-        if not analysis_text:
-            return ""
-        
-        # Ensure we have a string
-        if not isinstance(analysis_text, str):
-            return str(analysis_text)
-        
-        # Split into paragraphs and format
-        paragraphs = analysis_text.split('\n\n')
-        formatted_paragraphs = []
-        
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-                
-            # Handle bullet points and lists
-            if paragraph.startswith('*') or paragraph.startswith('-'):
-                # Convert to markdown list
-                lines = paragraph.split('\n')
-                formatted_lines = []
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('*') or line.startswith('-'):
-                        formatted_lines.append(f"• {line[1:].strip()}")
-                    else:
-                        formatted_lines.append(line)
-                formatted_paragraphs.append('\n'.join(formatted_lines))
-            else:
-                formatted_paragraphs.append(paragraph)
-        
-        return '\n\n'.join(formatted_paragraphs)
+        return _format_analysis_text(analysis_text)
+
+
+def get_app() -> StreamlitChatApp:
+    """App wired to the cached components"""
+    app = StreamlitChatApp()
+    app._do_init()
+    return app
 
 
 def main():
@@ -240,66 +478,43 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Initialize app
-    app = StreamlitChatApp()
+    # Components are built once per process and the app once per session;
+    # later reruns reuse both
+    try:
+        if "app" not in st.session_state:
+            st.session_state.app = get_app()
+        app = st.session_state.app
+    except Exception as e:
+        st.error(f"❌ Initialization failed: {str(e)}")
+        st.info("💡 Make sure your .env file exists with a valid API_URL")
+        st.stop()
     
-    # Custom CSS for better styling
-    st.markdown("""
-    <style>
-    .main-header {
-        text-align: center;
-        padding: 1rem 0;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    
-    .chat-message {
-        padding: 1rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        border-left: 4px solid #667eea;
-        background-color: #f8f9fa;
-    }
-    
-    .stButton > button {
-        width: 100%;
-        border-radius: 5px;
-        border: none;
-        padding: 0.5rem 1rem;
-        font-weight: 500;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Custom CSS for better styling; st.html (Streamlit 1.33+) applies a style-only
+    # block directly instead of passing it through the markdown renderer
+    if hasattr(st, 'html'):
+        st.html(_PAGE_STYLE)
+    else:
+        st.markdown(_PAGE_STYLE, unsafe_allow_html=True)
     
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🤖 API Chart Generator</h1>
-        <p>Transform your ideas into beautiful interactive charts with AI</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar configuration
     with st.sidebar:
         st.header("⚙️ Configuration")
         
         # Chart type selection
-        chart_type_options = {
-            "Auto-detect": None,
-            "📊 Bar Chart": "bar",
-            "📈 Line Chart": "line", 
-            "🥧 Pie Chart": "pie",
-            "📍 Scatter Plot": "scatter"
-        }
-        
         selected_chart_type = st.selectbox(
             "Chart Type",
-            options=list(chart_type_options.keys()),
+            options=_CHART_TYPE_LABELS,
             help="Choose a specific chart type or let AI auto-detect"
         )
-        chart_type = chart_type_options[selected_chart_type]
+        chart_type = _CHART_TYPE_OPTIONS[selected_chart_type]
+        
+        batch_mode = st.toggle(
+            "📚 Batch mode",
+            help="Treat blank-line separated parts of a message as separate chart requests, sent together"
+        )
         
         st.divider()
         
@@ -309,17 +524,16 @@ def main():
             
             # Show recent files
             st.header("📁 Recent Charts")
-            output_dir = Path("outputs")
-            if output_dir.exists():
-                html_files = sorted(output_dir.glob("*.html"), key=lambda x: x.stat().st_mtime, reverse=True)
-                
-                if html_files:
-                    for i, file_path in enumerate(html_files[:5]):  # Show last 5 files
-                        file_name = file_path.name[:30] + "..." if len(file_path.name) > 30 else file_path.name
-                        if st.button(f"📄 {file_name}", key=f"recent_{i}"):
-                            webbrowser.open(f"file://{file_path.absolute()}")
-                else:
-                    st.info("No charts generated yet")
+            output_dir = app.html_generator.output_dir
+            html_files = _recent_charts(app.html_generator, str(output_dir), _dir_mtime(output_dir))  # Show last 5 files
+            
+            if html_files:
+                for i, (name, abs_path) in enumerate(html_files):
+                    file_name = name[:30] + "..." if len(name) > 30 else name
+                    if st.button(f"📄 {file_name}", key=f"recent_{i}"):
+                        _open_in_browser(f"file://{abs_path}")
+            else:
+                st.info("No charts generated yet")
         else:
             st.error("🔴 Initialization failed")
             st.stop()
@@ -337,15 +551,28 @@ def main():
     
     # Initialize chat history
     if "messages" not in st.session_state:
-        st.session_state.messages = [
-            {
-                "role": "assistant",
-                "content": "👋 Hi! I'm your AI chart generator. Tell me what kind of chart you'd like to create!\n\n**Examples:**\n- *Create a pie chart showing market share*\n- *Generate monthly sales trends as a line chart*\n- *Show quarterly revenue comparison*\n\n💡 **Note:** If the chat input becomes unresponsive after your first message, please refresh the page. This is a known issue we're working to resolve."
-            }
-        ]
-    
-    # Display chat messages
-    for message in st.session_state.messages:
+        st.session_state.messages = _new_history(_WELCOME_MESSAGE)
+    
+    # Display chat messages; only the newest chart renders its details eagerly,
+    # older ones are built only when their toggle is switched on
+    messages = st.session_state.messages
+    latest_chart = next((i for i in range(len(messages) - 1, -1, -1) if "chart_info" in messages[i]), None)
+    
+    # Once the bounded history is full, charts that dropped out of it can be
+    # listed again from the output directory on request
+    if len(messages) == _MAX_MESSAGES and st.toggle("🕘 Show older charts", key="show_older"):
+        shown = {message["chart_info"]["html_path"] for message in messages if "chart_info" in message}
+        older = [path for path in app.html_generator.recent_output_files(len(shown) + _OLDER_CHARTS_LIMIT)
+                 if str(path) not in shown][:_OLDER_CHARTS_LIMIT]
+        
+        if older:
+            for path in older:
+                if st.button(f"📄 {path.name}", key=f"older_{path.stem}"):
+                    _open_in_browser(f"file://{path.absolute()}")
+        else:
+            st.info("No older charts on disk")
+    
+    for i, message in enumerate(messages):
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
             
@@ -355,7 +582,11 @@ def main():
                 # Handle both old and new response formats
                 response_data = chart_info.get("api_response") or chart_info.get("gemini_response")
                 if response_data:
-                    app.display_chart_info(chart_info["html_path"], response_data)
+                    html_path = chart_info["html_path"]
+                    if i == latest_chart or st.toggle(
+                            f"📊 Show details: {response_data.get('title', 'Chart')}",
+                            key=f"details_{Path(html_path).stem}"):
+                        app.display_chart_info(html_path, response_data)
     
     # Chat input - ensure it's always available
     prompt = st.chat_input("Describe the chart you want to create...")
@@ -371,74 +602,67 @@ def main():
         # Generate response with better error handling
         with st.chat_message("assistant"):
             try:
-                # Process the request
-                result = app.process_chart_request(prompt, chart_type)
-                
-                if result and result[0]:  # If successful
-                    html_path, api_response = result
-                    
-                    # Success message
-                    chart_type_display = api_response.get('chart_type', 'Unknown').title()
-                    analysis_available = api_response.get('prediction_analysis') is not None
-                    
-                    success_message = f"""
-                    🎉 **Chart Generated Successfully!**
-                    
-                    📊 **Chart Type:** {chart_type_display}
-                    📈 **Data Points:** {len(api_response.get('data', {}).get('labels', []))}
-                    💾 **Title:** {api_response.get('title', 'Generated Chart')}
-                    {f"🧠 **AI Analysis:** Available below" if analysis_available else ""}
-                    
-                    Your interactive chart has been created and saved!
-                    """
-                    
-                    st.markdown(success_message)
-                    
-                    # Display chart info
-                    app.display_chart_info(html_path, api_response)
-                    
-                    # Add to chat history with chart info
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": success_message,
-                        "chart_info": {
-                            "html_path": html_path,
-                            "api_response": api_response
-                        }
-                    })
+                # Process the request; in batch mode, blank-line separated prompts are sent together
+                prompts = [part.strip() for part in prompt.split('\n\n') if part.strip()] if batch_mode else [prompt]
+                if len(prompts) > 1:
+                    results = app.process_chart_requests(prompts, chart_type)
+                else:
+                    results = [app.process_chart_request(prompt, chart_type)]
                 
-                else:  # If failed
-                    error_message = """
-                    ❌ **Chart Generation Failed**
+                for result in results:
+                    html_path = None
+                    if result and result[0]:
+                        html_result, api_response = result
+                        
+                        if isinstance(html_result, Future):
+                            # A failed file write fails only this chart; the rest of a batch still shows
+                            try:
+                                with st.spinner("🌐 Generating HTML file..."):
+                                    html_path = html_result.result()
+                            except Exception as e:
+                                st.error(f"❌ Error generating HTML file: {str(e)}")
+                        else:
+                            html_path = html_result
                     
-                    Please try:
-                    - Being more specific about your data requirements
-                    - Checking your internet connection
-                    - Trying a different chart type
+                    if html_path:  # If successful
+                        # Success message
+                        template = (_SUCCESS_WITH_ANALYSIS_TEMPLATE
+                                    if api_response.get('prediction_analysis') is not None
+                                    else _SUCCESS_TEMPLATE)
+                        success_message = template.format(
+                            chart_type=api_response.get('chart_type', 'Unknown').title(),
+                            data_points=len(api_response.get('data', {}).get('labels', [])),
+                            title=api_response.get('title', 'Generated Chart')
+                        )
+                        
+                        st.markdown(success_message)
+                        
+                        # Display chart info
+                        app.display_chart_info(html_path, api_response)
+                        
+                        # Add to chat history with chart info; only the displayed fields
+                        # are kept, since session state is carried across every rerun
+                        st.session_state.messages.append({
+                            "role": "assistant",
+                            "content": success_message,
+                            "chart_info": {
+                                "html_path": html_path,
+                                "api_response": _chart_summary(api_response)
+                            }
+                        })
                     
-                    Example: *"Create a pie chart showing smartphone market share with 5-6 brands"*
-                    """
-                    
-                    st.markdown(error_message)
-                    st.session_state.messages.append({"role": "assistant", "content": error_message})
+                    else:  # If failed
+                        error_message = _FAILURE_MESSAGE
+                        
+                        st.markdown(error_message)
+                        st.session_state.messages.append({"role": "assistant", "content": error_message})
             
             except Exception as e:
                 # Handle any unexpected errors to prevent chat input from breaking
-                error_message = f"""
-                ❌ **Unexpected Error Occurred**
-                
-                Error details: {str(e)}
-                
-                Please try again with a different request. The chat input should remain functional.
-                
-                💡 **Tip:** Try a simpler request like "Create a bar chart with sample data"
-                """
+                error_message = _UNEXPECTED_ERROR_TEMPLATE.format(error=str(e))
                 
                 st.error(error_message)
                 st.session_state.messages.append({"role": "assistant", "content": error_message})
-                
-                # Force rerun to ensure chat input remains available
-                st.rerun()
     
     # Chat controls
     st.divider()
@@ -446,12 +670,7 @@ def main():
     
     with col1:
         if st.button("🔄 Reset Chat", help="Clear all messages and reset the chat"):
-            st.session_state.messages = [
-                {
-                    "role": "assistant",
-                    "content": "👋 Chat has been reset! Tell me what kind of chart you'd like to create!"
-                }
-            ]
+            st.session_state.messages = _new_history(_RESET_MESSAGE)
             st.rerun()
     
     with col2: